@@ -0,0 +1,349 @@
+"""
+Reader for the .blend file format, without Blender.
+
+A .blend is a header followed by a chain of blocks, each a BHead (code,
+SDNA struct index, old memory address, length, count) and its data. ID
+blocks have a two letter code ("NT" node tree, "MA" material, ...) and
+start with the ID struct; the DNA1 block near the end describes the
+layout of every struct (SDNA), which is how the offsets of ID.name and
+ID.asset_data are found for the Blender version that wrote the file.
+
+Both header layouts are understood: the legacy 12 byte "BLENDER-v405"
+with 4 or 8 byte pointers and either endianness, and the 17 byte
+"BLENDER17-01v0500" of Blender 5.0 with its 64 bit block headers.
+Files are memory-mapped and only the bytes that are needed are read;
+zstd compressed files are decompressed first (needs `zstandard`, which
+Blender ships).
+"""
+
+import json
+import mmap
+import os
+import re
+import struct
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from .Logger import log
+
+
+INDEX_VERSION = 1
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_ENDB = b"ENDB"
+_DNA1 = b"DNA1"
+_MEMBER_NAME = re.compile(r"\w+")
+
+
+class BlendError(Exception):
+    """Not a .blend file, or one that is truncated or damaged."""
+
+
+@contextmanager
+def _mapped(path):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise BlendError("empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            if m[:4] != _ZSTD_MAGIC:
+                yield m
+                return
+            try:
+                import zstandard
+            except ImportError:
+                raise BlendError("compressed, and zstandard is not available") from None
+            # Blender writes a sequence of frames so files can be read in parallel
+            with zstandard.ZstdDecompressor().stream_reader(m, read_across_frames=True) as reader:
+                yield reader.read()
+
+
+class BlendFile:
+    """Block level view of a .blend held in buf (an mmap or bytes)."""
+
+    def __init__(self, buf):
+        self.buf = buf
+        head = bytes(buf[:17])
+        if not head.startswith(b"BLENDER"):
+            raise BlendError("not a .blend file")
+
+        if head[7:9].isdigit():
+            # BLENDER17-01v0500: header size, pointer size, format, endian, version
+            if head[7:9] != b"17" or head[9:12] != b"-01" or head[12:13] != b"v":
+                raise BlendError(f"unsupported header {head!r}")
+            self.header_size = 17
+            self.pointer_size = 8
+            self.endian = "<"
+            self.version = int(head[13:17])
+            # code, SDNAnr, old, len, nr
+            self._bhead = struct.Struct("<4siQqq")
+            self._order = (0, 1, 2, 3, 4)
+        else:
+            if head[7:8] not in (b"_", b"-") or head[8:9] not in (b"v", b"V"):
+                raise BlendError(f"unsupported header {head[:12]!r}")
+            self.header_size = 12
+            self.pointer_size = 8 if head[7:8] == b"-" else 4
+            self.endian = "<" if head[8:9] == b"v" else ">"
+            self.version = int(head[9:12])
+            # code, len, old, SDNAnr, nr
+            self._bhead = struct.Struct(
+                self.endian + ("4siQii" if self.pointer_size == 8 else "4siIii")
+            )
+            self._order = (0, 3, 2, 1, 4)
+        self._sdna = None
+
+    def blocks(self):
+        """Yield (code, sdna_index, old_address, length, count, data_offset)."""
+        buf = self.buf
+        size = len(buf)
+        unpack = self._bhead.unpack_from
+        bhead_size = self._bhead.size
+        code_i, sdna_i, old_i, len_i, nr_i = self._order
+        offset = self.header_size
+
+        while True:
+            if offset + bhead_size > size:
+                raise BlendError(f"truncated at {offset}, no ENDB block")
+            fields = unpack(buf, offset)
+            code = fields[code_i]
+            if code == _ENDB:
+                return
+            data = offset + bhead_size
+            length = fields[len_i]
+            if length < 0 or data + length > size:
+                raise BlendError(f"block {code!r} at {offset} runs past the end of the file")
+            yield code, fields[sdna_i], fields[old_i], length, fields[nr_i], data
+            offset = data + length
+
+    @property
+    def sdna(self):
+        if self._sdna is None:
+            for code, _, _, length, _, data in self.blocks():
+                if code == _DNA1:
+                    self._sdna = _SDNA(self, data, length)
+                    break
+            else:
+                raise BlendError("no DNA1 block")
+        return self._sdna
+
+    def ids(self):
+        """
+        Every local ID in the file as a dict with type (the two letter
+        code), name, asset (marked as asset), catalog (catalog UUID of an
+        asset, or None) and offset (of its block's data).
+        """
+        sdna = self.sdna
+        members = sdna.members("ID")
+        if "name" not in members:
+            raise BlendError("SDNA has no ID.name")
+        name_offset, name_size = members["name"]
+        asset_offset = members.get("asset_data", (None,))[0]
+        meta = sdna.index_of("AssetMetaData")
+        catalog_offset = sdna.members("AssetMetaData").get("catalog_id", (None,))[0]
+        pointer = struct.Struct(self.endian + ("Q" if self.pointer_size == 8 else "I"))
+        read_pointer = pointer.unpack_from
+        buf = self.buf
+
+        ids = []
+        asset_blocks = {}
+        for code, sdna_index, old, length, _, data in self.blocks():
+            # Two letter codes are IDs; "ID" marks placeholders of linked ones
+            if code[2:] == b"\0\0" and code[:2].isupper() and code[:2] != b"ID":
+                if length < name_offset + name_size:
+                    raise BlendError(f"ID block at {data} is too short")
+                raw = bytes(buf[data + name_offset:data + name_offset + name_size])
+                name = raw.split(b"\0", 1)[0].decode("utf-8", "replace")
+                pointer = read_pointer(buf, data + asset_offset)[0] if asset_offset is not None else 0
+                ids.append(
+                    {
+                        "type": name[:2],
+                        "name": name[2:],
+                        "asset": bool(pointer),
+                        "catalog": pointer or None,
+                        "offset": data,
+                    }
+                )
+            elif meta is not None and sdna_index == meta and catalog_offset is not None:
+                asset_blocks[old] = data
+
+        for entry in ids:
+            data = asset_blocks.get(entry["catalog"])
+            entry["catalog"] = None if data is None else self._uuid(data + catalog_offset)
+        return ids
+
+    def _uuid(self, offset):
+        # bUUID: time_low, time_mid, time_hi_and_version, clock_seq_hi, clock_seq_low, node[6]
+        a, b, c, d, e, node = struct.unpack_from(self.endian + "IHHBB6s", self.buf, offset)
+        if not (a or b or c or d or e or any(node)):
+            return None
+        return f"{a:08x}-{b:04x}-{c:04x}-{d:02x}{e:02x}-{node.hex()}"
+
+
+class _SDNA:
+    """Struct layouts of the DNA1 block, as far as the index needs them."""
+
+    def __init__(self, blend, offset, length):
+        buf = blend.buf
+        e = blend.endian
+        end = offset + length
+        pos = offset
+
+        def tag(expected):
+            nonlocal pos
+            if bytes(buf[pos:pos + 4]) != expected:
+                raise BlendError(f"SDNA: expected {expected!r} at {pos}")
+            pos += 4
+
+        def align():
+            nonlocal pos
+            pos = offset + ((pos - offset + 3) & ~3)
+
+        def strings():
+            nonlocal pos
+            count = struct.unpack_from(e + "i", buf, pos)[0]
+            pos += 4
+            items = []
+            for _ in range(count):
+                stop = buf.find(b"\0", pos, end)
+                if stop < 0:
+                    raise BlendError("SDNA: unterminated name")
+                items.append(bytes(buf[pos:stop]).decode("ascii", "replace"))
+                pos = stop + 1
+            align()
+            return items
+
+        tag(b"SDNA")
+        tag(b"NAME")
+        self.names = strings()
+        tag(b"TYPE")
+        self.types = strings()
+        tag(b"TLEN")
+        self.lengths = struct.unpack_from(f"{e}{len(self.types)}H", buf, pos)
+        pos += 2 * len(self.types)
+        align()
+        tag(b"STRC")
+        count = struct.unpack_from(e + "i", buf, pos)[0]
+        pos += 4
+        # struct type name -> (SDNA index, [(type index, name index)])
+        self.structs = {}
+        for index in range(count):
+            type_index, n = struct.unpack_from(e + "hh", buf, pos)
+            fields = struct.unpack_from(f"{e}{2 * n}h", buf, pos + 4)
+            pos += 4 + 4 * n
+            self.structs[self.types[type_index]] = (index, list(zip(fields[::2], fields[1::2])))
+
+        self.pointer_size = blend.pointer_size
+        self._members = {}
+
+    def index_of(self, struct_name):
+        entry = self.structs.get(struct_name)
+        return None if entry is None else entry[0]
+
+    def members(self, struct_name):
+        """{member name: (offset, size)} of a struct, {} if it does not exist."""
+        if struct_name not in self._members:
+            members = {}
+            offset = 0
+            for type_index, name_index in self.structs.get(struct_name, (None, []))[1]:
+                name = self.names[name_index]
+                count = 1
+                for dim in re.findall(r"\[(\d+)\]", name):
+                    count *= int(dim)
+                if name.startswith(("*", "(*")):
+                    size = self.pointer_size * count
+                else:
+                    size = self.lengths[type_index] * count
+                members[_MEMBER_NAME.search(name).group()] = (offset, size)
+                offset += size
+            self._members[struct_name] = members
+        return self._members[struct_name]
+
+
+def read_index(path):
+    """Index of the IDs in the .blend at path: {"version", "ids"}."""
+    with _mapped(path) as buf:
+        try:
+            blend = BlendFile(buf)
+            return {"version": blend.version, "ids": blend.ids()}
+        except (struct.error, ValueError, IndexError) as e:
+            # Offsets or counts that point outside of their block
+            raise BlendError(f"damaged: {e}") from None
+
+
+def assets(index, id_type=None):
+    """The asset-marked entries of an index, optionally of one ID type."""
+    return [
+        entry
+        for entry in index["ids"]
+        if entry["asset"] and (id_type is None or entry["type"] == id_type)
+    ]
+
+
+class BlendIndex:
+    """
+    read_index() results cached per git blob sha in Data/blend_index/<sha>.json.
+    A file is parsed once per content; later lookups are a dict access and
+    never touch bpy.data or the .blend itself.
+    """
+
+    def __init__(self, folder):
+        self.folder = Path(folder)
+        # sha -> (index, {(type, name): entry})
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def _path(self, sha):
+        return self.folder / f"{sha}.json"
+
+    def get(self, path, sha):
+        """Index of the .blend at path whose content has sha. Raises BlendError."""
+        with self._lock:
+            loaded = self._loaded.get(sha)
+        if loaded is not None:
+            return loaded[0]
+
+        index = None
+        try:
+            with open(self._path(sha), "r") as f:
+                index = json.load(f)
+            if index.get("index_version") != INDEX_VERSION:
+                index = None
+        except (OSError, ValueError):
+            pass
+
+        if index is None:
+            index = read_index(path)
+            index["index_version"] = INDEX_VERSION
+            self._write(sha, index)
+            log.debug("Indexed %s: %s IDs", Path(path).name, len(index["ids"]))
+
+        by_name = {(entry["type"], entry["name"]): entry for entry in index["ids"]}
+        with self._lock:
+            self._loaded[sha] = (index, by_name)
+        return index
+
+    def find(self, path, sha, name, id_type="NT"):
+        """Index entry of the ID called name, or None."""
+        self.get(path, sha)
+        with self._lock:
+            return self._loaded[sha][1].get((id_type, name))
+
+    def _write(self, sha, index):
+        tmp = self._path(sha).with_suffix(".tmp")
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w") as f:
+                f.write(json.dumps(index))
+            os.replace(tmp, self._path(sha))
+        except OSError as e:
+            log.warning("Could not write blend index: %s", e)
+
+    def prune(self, keep):
+        """Remove the cached indexes of every sha for which keep(sha) is false."""
+        if not self.folder.exists():
+            return
+        for path in self.folder.glob("*.json"):
+            if not keep(path.stem):
+                path.unlink(missing_ok=True)
+                with self._lock:
+                    self._loaded.pop(path.stem, None)
@@ -0,0 +1,85 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+from .Logger import log
+
+
+class HTTPCache:
+    """
+    Persistent conditional-request cache for GitHub JSON responses.
+    Keeps the ETag / Last-Modified validators and the parsed body for each
+    URL in a JSON file under Data/, so the next request can be sent with
+    If-None-Match / If-Modified-Since. A 304 answer is a cache hit and
+    does not count against GitHub's rate limit.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.hits = 0
+        self.misses = 0
+        self._entries = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, "r") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def conditional_headers(self, url):
+        """Return the validator headers to send for url (may be empty)."""
+        with self._lock:
+            entry = self._load().get(url)
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def hit(self, url):
+        """Return the cached body for url after a 304, or None if it is gone."""
+        with self._lock:
+            entry = self._load().get(url)
+            if entry is None:
+                return None
+            self.hits += 1
+            return entry["body"]
+
+    def store(self, url, headers, body):
+        """Remember the validators and parsed body of a fresh 200 response."""
+        with self._lock:
+            self.misses += 1
+            etag = headers.get("ETag")
+            last_modified = headers.get("Last-Modified")
+            if not etag and not last_modified:
+                return
+            self._load()[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "body": body,
+            }
+            self._dirty = True
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            try:
+                with open(tmp, "w") as f:
+                    f.write(json.dumps(self._entries))
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError as e:
+                log.warning("Could not write HTTP cache: %s", e)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
@@ -0,0 +1,279 @@
+"""
+Per-catalog preset layout.
+
+Besides one monolithic preset.blend, a version folder of the preset
+repository may split the presets into one .blend per asset catalog,
+listed in the manifest with the catalog they hold:
+
+    {"name": "catalogs/<catalog uuid>.blend", "catalog": "<catalog uuid>", ...}
+
+Clients then download the catalogs the user enabled (Catalogs.Enabled in
+settings.json, a list of catalog UUIDs, null for all of them) plus those
+used by files they opened within Catalogs.Touched_TTL seconds, and fetch
+others on demand in the background when they are enabled or a file needs
+one. Data/catalogs.json remembers
+what the last manifest offered and which catalogs are local; catalogs
+that are switched off keep their blob in the content store, so switching
+them back on needs no download.
+
+Only the manifest describes the layout; publishers keep preset.blend next
+to catalogs/ for older add-on versions and the contents API fallback.
+split_preset() produces the layout from a monolithic preset.blend when
+publishing, from inside Blender.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from .constants import BRD_CONST_DATA, settings
+from .Logger import log
+
+
+CATALOG_FOLDER = "catalogs"
+
+_UUID = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$")
+
+
+def is_catalog_uuid(text):
+    return bool(_UUID.match(text))
+
+
+def catalog_of(filepath):
+    """Catalog UUID of a catalog .blend path, else None."""
+    path = Path(filepath)
+    if path.parent.name == CATALOG_FOLDER and path.suffix == ".blend" and is_catalog_uuid(path.stem):
+        return path.stem
+    return None
+
+
+def read_cats(path):
+    """[(uuid, catalog path, simple name)] of a blender_assets.cats.txt."""
+    catalogs = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith(("#", "VERSION")):
+                    continue
+                parts = line.split(":", 2)
+                if len(parts) == 3 and is_catalog_uuid(parts[0]):
+                    catalogs.append(tuple(parts))
+    except OSError:
+        pass
+    return catalogs
+
+
+_names = {"stamp": None, "names": {}}
+
+
+def catalog_names():
+    """{uuid: catalog path} of Data/blender_assets.cats.txt, re-read when it changes."""
+    cats = BRD_CONST_DATA.Folder / "blender_assets.cats.txt"
+    try:
+        st = cats.stat()
+        stamp = (st.st_size, st.st_mtime_ns)
+    except OSError:
+        stamp = None
+    if stamp != _names["stamp"]:
+        _names["stamp"] = stamp
+        _names["names"] = {uuid: path for uuid, path, _ in read_cats(cats)}
+    return _names["names"]
+
+
+def split_listing(listing):
+    """{uuid: entry} of the catalog files in a version listing, {} if not split."""
+    return {
+        item["catalog"]: item
+        for item in listing
+        if item.get("catalog") and item["name"].endswith(".blend")
+    }
+
+
+def layout_sha(available):
+    """One sha standing for a whole split layout, changes with any catalog."""
+    h = hashlib.sha1()
+    for uuid in sorted(available):
+        h.update(f"{uuid}:{available[uuid]['sha']}\n".encode())
+    return h.hexdigest()
+
+
+class CatalogCache:
+    """
+    State of the split layout in Data/catalogs.json: the catalogs the last
+    manifest listed for the version in use (available), the ones present
+    in the version folder (local, uuid -> sha) and the ones opened files
+    used (touched, uuid -> when a file last used it).
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._state = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._state is None:
+            try:
+                with open(self.path, "r") as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError):
+                self._state = {}
+            for key in ("available", "local"):
+                self._state.setdefault(key, {})
+            self._state.setdefault("version", None)
+            touched = self._state.setdefault("touched", {})
+            if isinstance(touched, list):
+                # Written before touched catalogs aged: count them as used now
+                self._state["touched"] = dict.fromkeys(touched, time.time())
+        return self._state
+
+    def save(self):
+        with self._lock:
+            if self._state is None:
+                return
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            try:
+                with open(tmp, "w") as f:
+                    f.write(json.dumps(self._state))
+                os.replace(tmp, self.path)
+            except OSError as e:
+                log.warning("Could not write catalog cache: %s", e)
+
+    @property
+    def version(self):
+        with self._lock:
+            return self._load()["version"]
+
+    def available(self):
+        with self._lock:
+            return dict(self._load()["available"])
+
+    def set_available(self, version, available):
+        with self._lock:
+            state = self._load()
+            if state["version"] != version:
+                # Catalog files of another version folder are not ours anymore
+                state["local"] = {}
+            state["version"] = version
+            state["available"] = available
+
+    def clear(self):
+        """The version went back to a single preset.blend."""
+        with self._lock:
+            state = self._load()
+            state["available"] = {}
+            state["local"] = {}
+
+    def local(self):
+        with self._lock:
+            return dict(self._load()["local"])
+
+    def record(self, uuid, sha):
+        with self._lock:
+            self._load()["local"][uuid] = sha
+
+    def forget(self, uuid):
+        with self._lock:
+            self._load()["local"].pop(uuid, None)
+
+    @staticmethod
+    def _touched_since():
+        return time.time() - settings.get("Catalogs", "Touched_TTL", default=30 * 86400)
+
+    def touched(self):
+        """Catalogs a file used within Catalogs.Touched_TTL."""
+        since = self._touched_since()
+        with self._lock:
+            return {uuid for uuid, seen in self._load()["touched"].items() if seen >= since}
+
+    def touch(self, uuids):
+        """
+        Remember that a file uses these catalogs, dropping the ones no file
+        used within Catalogs.Touched_TTL. Returns the ones not in use before.
+        """
+        now = time.time()
+        since = self._touched_since()
+        with self._lock:
+            state = self._load()
+            touched = {uuid: seen for uuid, seen in state["touched"].items() if seen >= since}
+            new = set(uuids) - set(touched)
+            touched.update(dict.fromkeys(uuids, now))
+            state["touched"] = touched
+        self.save()
+        return new
+
+    def untouch(self, uuid):
+        """The user switched the catalog off, until a file uses it again."""
+        with self._lock:
+            self._load()["touched"].pop(uuid, None)
+
+    def wanted(self):
+        """Catalogs to keep local: the enabled ones (all if unset) and the touched ones."""
+        available = set(self.available())
+        enabled = settings.get("Catalogs", "Enabled", default=None)
+        chosen = available if enabled is None else set(enabled) & available
+        return chosen | (self.touched() & available)
+
+
+catalog_cache = CatalogCache(BRD_CONST_DATA.Folder / "catalogs.json")
+
+
+def preset_files():
+    """
+    [(path, sha)] of the local preset .blend files: preset.blend, or the
+    local catalog files in the split layout.
+    """
+    dyn = settings.dyn
+    if not dyn.File_Location:
+        return []
+    location = Path(dyn.File_Location)
+    if location.is_file():
+        return [(location, dyn.sha)]
+    if location.name != CATALOG_FOLDER:
+        return []
+    return [
+        (location / f"{uuid}.blend", sha)
+        for uuid, sha in sorted(catalog_cache.local().items())
+        if (location / f"{uuid}.blend").is_file()
+    ]
+
+
+def split_preset(source, version_folder):
+    """
+    Publishing helper, run inside Blender: write the node group assets of
+    the preset .blend at source into version_folder/catalogs/<uuid>.blend,
+    one file per catalog. Assets without a catalog stay in source only.
+    Returns {uuid: number of node groups}.
+    """
+    import bpy
+    from .Blend import assets, read_index
+
+    by_catalog = defaultdict(list)
+    for entry in assets(read_index(source), "NT"):
+        if entry["catalog"]:
+            by_catalog[entry["catalog"]].append(entry["name"])
+
+    names = [name for group in by_catalog.values() for name in group]
+    with bpy.data.libraries.load(str(source), link=False, assets_only=True) as (data_from, data_to):
+        data_to.node_groups = names
+    # Same order as requested, whatever they got renamed to on import
+    loaded = dict(zip(names, data_to.node_groups))
+
+    out = Path(version_folder) / CATALOG_FOLDER
+    out.mkdir(parents=True, exist_ok=True)
+    written = {}
+    try:
+        for uuid, group in by_catalog.items():
+            blocks = {loaded[name] for name in group if loaded.get(name) is not None}
+            bpy.data.libraries.write(str(out / f"{uuid}.blend"), blocks, fake_user=True)
+            written[uuid] = len(blocks)
+    finally:
+        for tree in loaded.values():
+            if tree is not None:
+                bpy.data.node_groups.remove(tree)
+    return written
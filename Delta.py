@@ -0,0 +1,267 @@
+"""
+Block-level delta updates for preset.blend (zsync style).
+
+The preset repository publishes `<file>.zsync.json` next to the file:
+
+    {
+        "version": 1,
+        "block_size": 65536,
+        "size": <size of the new file>,
+        "sha": "<git blob sha of the new file>",
+        "blocks": [[<weak>, "<strong>"], ...]
+    }
+
+with one rolling (weak) and one SHA-1 (strong) checksum per block of the
+new file. The client steps through its old local copy, reuses every block
+it already has at any offset, streams only the missing byte ranges with
+HTTP Range requests into a file next to the old one and verifies it
+before swapping it into place.
+
+This module only depends on the standard library (and utils, which loads
+requests lazily) so it can also be used to publish signatures outside
+Blender (see build_signature()).
+"""
+
+import hashlib
+import heapq
+import json
+import mmap
+import os
+from itertools import accumulate
+from pathlib import Path
+
+from .utils import git_blob_sha
+
+
+SIGNATURE_SUFFIX = ".zsync.json"
+DEFAULT_BLOCK_SIZE = 1 << 16
+
+# Bytes walked one at a time with the rolling checksum, per file, and
+# blocks walked after each break in a run of matches
+SCAN_LIMIT = 1 << 20
+RESYNC_BLOCKS = 8
+
+_MOD = 1 << 16
+_CHUNK = 1 << 16
+
+
+class DeltaError(Exception):
+    pass
+
+
+def _weak(block):
+    # rsync rolling checksum: a = sum(x_i), b = sum((L - i) * x_i), both mod 2^16
+    # sum((L - i) * x_i) is the sum of the running prefix sums
+    a = sum(block) % _MOD
+    b = sum(accumulate(block)) % _MOD
+    return a, b
+
+
+def _pack(a, b):
+    return a | (b << 16)
+
+
+def _strong(block):
+    return hashlib.sha1(block).hexdigest()
+
+
+def build_signature(path, block_size=DEFAULT_BLOCK_SIZE):
+    """Return the published signature for the file at path."""
+    blocks = []
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            # The last block is zero padded so every block has the same length
+            block = block.ljust(block_size, b"\0")
+            blocks.append([_pack(*_weak(block)), _strong(block)])
+    return {
+        "version": 1,
+        "block_size": block_size,
+        "size": os.path.getsize(path),
+        "sha": git_blob_sha(path),
+        "blocks": blocks,
+    }
+
+
+def write_signature(path, block_size=DEFAULT_BLOCK_SIZE):
+    """Write <path>.zsync.json next to path and return its location."""
+    out = Path(str(path) + SIGNATURE_SUFFIX)
+    with open(out, "w") as f:
+        json.dump(build_signature(path, block_size), f)
+    return out
+
+
+def match_blocks(local_path, signature, scan_limit=SCAN_LIMIT, fetch_limit=None):
+    """
+    Find where each block of the new file already exists in the local file.
+    Returns {new block index: local offset}.
+
+    The local file is stepped through a block at a time comparing strong
+    checksums, which finds at C speed every block that stayed in place or
+    moved by whole blocks; a run of matches keeps its alignment. Only where
+    a run breaks (bytes inserted or removed) is the rolling checksum walked
+    byte by byte to find the new alignment, for RESYNC_BLOCKS blocks after
+    each break and scan_limit bytes in all, so a file that changed
+    everywhere (a re-saved .blend rewrites the pointers of every block)
+    costs little more than one hashing pass.
+    With fetch_limit set, raises DeltaError as soon as more than that part
+    of the new file can no longer be found locally.
+    """
+    size = signature["block_size"]
+    blocks = signature["blocks"]
+    weak_sums = {weak for weak, _ in blocks}
+    by_strong = {}
+    for index, (_, strong) in enumerate(blocks):
+        by_strong.setdefault(strong, []).append(index)
+
+    found = {}
+    # Blocks not found yet, per strong checksum
+    pending = {strong: len(indices) for strong, indices in by_strong.items()}
+    unmatched = [len(blocks)]
+
+    def claim(window, offset):
+        strong = _strong(window)
+        if strong not in by_strong:
+            return False
+        if strong in pending:
+            for index in by_strong[strong]:
+                found.setdefault(index, offset)
+            unmatched[0] -= pending.pop(strong)
+        return True
+
+    n = os.path.getsize(local_path)
+    if not n:
+        return found
+    limit = None if fetch_limit is None else signature["size"] * fetch_limit
+
+    def hopeless(offset):
+        # Matches never overlap: at most this many windows are left to claim
+        windows = (n - offset) // size + 1
+        if windows >= len(pending):
+            return False
+        reachable = sum(heapq.nlargest(windows, pending.values()))
+        return (unmatched[0] - reachable) * size > limit
+
+    with open(local_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        # The new file's last block is zero padded; try it against our tail
+        tail = signature["size"] % size
+        if tail and n >= tail:
+            claim(data[n - tail:].ljust(size, b"\0"), n - tail)
+
+        end = n - size
+        offset = 0
+        walk_left = scan_limit
+        run_left = RESYNC_BLOCKS * size
+        misses = 0
+        while offset <= end:
+            if claim(data[offset:offset + size], offset):
+                offset += size
+                run_left = RESYNC_BLOCKS * size
+                continue
+
+            misses += 1
+            if limit is not None and misses % 16 == 0 and hopeless(offset):
+                raise DeltaError(f"less than {1 - fetch_limit:.0%} of the file is reusable")
+
+            steps = min(size, run_left, walk_left, end - offset)
+            if steps <= 0:
+                offset += size
+                continue
+
+            run_left -= steps
+            walk_left -= steps
+            a, b = _weak(data[offset:offset + size])
+            for position in range(offset + 1, offset + steps + 1):
+                out_byte = data[position - 1]
+                a = (a - out_byte + data[position + size - 1]) % _MOD
+                b = (b - size * out_byte + a) % _MOD
+                if _pack(a, b) in weak_sums and claim(data[position:position + size], position):
+                    offset = position + size
+                    run_left = RESYNC_BLOCKS * size
+                    break
+            else:
+                offset += size
+
+    return found
+
+
+def missing_ranges(signature, found):
+    """Coalesce the blocks that are not available locally into byte ranges."""
+    size = signature["block_size"]
+    total = signature["size"]
+    ranges = []
+    for index in range(len(signature["blocks"])):
+        if index in found:
+            continue
+        start = index * size
+        stop = min(start + size, total) - 1
+        if ranges and ranges[-1][1] + 1 == start:
+            ranges[-1][1] = stop
+        else:
+            ranges.append([start, stop])
+    return ranges
+
+
+def _fetch_range(session, url, start, stop, out, timeout, progress):
+    """Stream bytes start..stop of url into the open file out."""
+    headers = {"Range": f"bytes={start}-{stop}"}
+    received = 0
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as r:
+        if r.status_code != 206:
+            raise DeltaError(f"range request returned {r.status_code}")
+        for chunk in r.iter_content(chunk_size=_CHUNK):
+            received += len(chunk)
+            if received > stop - start + 1:
+                raise DeltaError("long range response")
+            out.write(chunk)
+            if progress is not None:
+                progress(len(chunk))
+    if received != stop - start + 1:
+        raise DeltaError("short range response")
+
+
+def apply_delta(
+    session, url, local_path, dest, signature, timeout=(3, 30), fetch_limit=0.7, progress=None
+):
+    """
+    Rebuild the new file at dest from the old local_path plus the missing
+    ranges of url, streamed straight into a .delta.part file. Gives up with
+    DeltaError, before anything is fetched, if more than fetch_limit of the
+    file would have to be downloaded anyway, so the caller can fall back to
+    a plain download. progress, if given, is called with the size of each
+    chunk received. Returns (bytes fetched, bytes reused).
+    """
+    size = signature["block_size"]
+    total = signature["size"]
+
+    found = match_blocks(local_path, signature, fetch_limit=fetch_limit)
+    ranges = missing_ranges(signature, found)
+    to_fetch = sum(stop - start + 1 for start, stop in ranges)
+
+    if to_fetch > total * fetch_limit:
+        raise DeltaError(f"delta would fetch {to_fetch} of {total} bytes")
+
+    stops = dict(ranges)
+    tmp = Path(str(dest) + ".delta.part")
+    try:
+        with open(local_path, "rb") as old, open(tmp, "wb") as out:
+            index = 0
+            n_blocks = len(signature["blocks"])
+            while index < n_blocks:
+                start = index * size
+                if start in stops:
+                    _fetch_range(session, url, start, stops[start], out, timeout, progress)
+                    index = -(-(stops[start] + 1) // size)
+                    continue
+                old.seek(found[index])
+                out.write(old.read(min(size, total - start)))
+                index += 1
+
+        if os.path.getsize(tmp) != total or git_blob_sha(tmp) != signature["sha"]:
+            raise DeltaError("rebuilt file failed verification")
+    except BaseException:
+        # Also on a cancelled job: nothing resumes a delta
+        tmp.unlink(missing_ok=True)
+        raise
+
+    os.replace(tmp, dest)
+    return to_fetch, total - to_fetch
@@ -0,0 +1,409 @@
+import hashlib
+import lzma
+import os
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from .Delta import DeltaError, apply_delta
+from .Logger import log
+from .utils import file_url_path, get_session, git_blob_sha
+
+try:
+    import zstandard
+
+    _ZSTD_ERRORS = (zstandard.ZstdError,)
+except ImportError:
+    zstandard = None
+    _ZSTD_ERRORS = ()
+
+
+CHUNK_SIZE = 1 << 16
+
+# Global cap on concurrent artifact downloads
+MAX_WORKERS = 4
+
+# Compressed siblings of an artifact, in order of preference
+COMPRESSED_SUFFIXES = {".zst": "zst", ".xz": "xz", ".gz": "gz"}
+
+
+class DownloadError(Exception):
+    pass
+
+
+class BandwidthLimiter:
+    """
+    Token bucket shared by every download thread.
+    rate is in bytes per second, 0 means unlimited.
+    """
+
+    def __init__(self, rate=0):
+        self.rate = rate
+        self._allowance = rate
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, n):
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(
+                self.rate, self._allowance + (now - self._last) * self.rate
+            )
+            self._last = now
+            self._allowance -= n
+            wait = -self._allowance / self.rate if self._allowance < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+limiter = BandwidthLimiter()
+_slots = threading.BoundedSemaphore(MAX_WORKERS)
+
+
+def configure(workers=None, bandwidth=None):
+    """Apply the Network section of settings.json (workers, bytes/s)."""
+    global MAX_WORKERS, _slots
+    if bandwidth is not None:
+        limiter.rate = int(bandwidth)
+    if workers and int(workers) != MAX_WORKERS:
+        MAX_WORKERS = max(1, int(workers))
+        _slots = threading.BoundedSemaphore(MAX_WORKERS)
+
+
+def _part_path(dest, sha):
+    # The blob sha is part of the name so a leftover from another preset
+    # version is never resumed into this one.
+    tag = sha[:12] if sha else "download"
+    return dest.with_name(f"{dest.name}.{tag}.part")
+
+
+def _remove_stale_parts(dest, keep):
+    for item in dest.parent.glob(f"{dest.name}.*.part"):
+        if item != keep:
+            item.unlink(missing_ok=True)
+
+
+def _fetch_into(url, part, timeout, progress=None):
+    """
+    Append the remainder of url to part, resuming from its current size
+    with a Range request. Returns the number of bytes transferred.
+    """
+    import requests
+
+    offset = part.stat().st_size if part.exists() else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+    with get_session().get(url, headers=headers, stream=True, timeout=timeout) as r:
+        if r.status_code == 416:
+            # Nothing left to send for this offset — let verification decide
+            return 0
+        r.raise_for_status()
+
+        if offset and r.status_code != 206:
+            log.debug("Server ignored Range for %s, restarting", part.name)
+            offset = 0
+
+        transferred = 0
+        with open(part, "ab" if offset else "wb") as f:
+            for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                limiter.consume(len(chunk))
+                f.write(chunk)
+                transferred += len(chunk)
+                if progress is not None:
+                    progress(len(chunk))
+
+    return transferred
+
+
+def download_file(url, dest, sha=None, size=None, timeout=(3, 30), attempts=3, progress=None):
+    """
+    Download url to dest without ever leaving a truncated dest behind.
+    Data is written to a sibling .part file, resumed with HTTP Range after a
+    dropped connection (also across Blender sessions), checked against the
+    git blob sha and size when known, and only then swapped into place with
+    os.replace. The previous dest stays untouched on any failure.
+    progress, if given, is called with the size of every chunk received.
+    Returns the number of bytes transferred. Raises DownloadError.
+    """
+    import requests
+
+    dest = Path(dest)
+    part = _part_path(dest, sha)
+    _remove_stale_parts(dest, part)
+
+    if size is not None and part.exists() and part.stat().st_size > size:
+        part.unlink()
+
+    transferred = 0
+    restarted = False
+    last_error = None
+
+    for attempt in range(attempts):
+        if size is None or not part.exists() or part.stat().st_size < size:
+            try:
+                transferred += _fetch_into(url, part, timeout, progress)
+            except requests.RequestException as e:
+                last_error = e
+                log.debug("Download of %s interrupted (attempt %s): %s", dest.name, attempt + 1, e)
+                continue
+
+        if size is not None and part.stat().st_size != size:
+            last_error = DownloadError(
+                f"size mismatch for {dest.name}: {part.stat().st_size} != {size}"
+            )
+            continue
+
+        if sha and git_blob_sha(part) != sha:
+            part.unlink()
+            if restarted:
+                raise DownloadError(f"sha mismatch for {dest.name}")
+            # A corrupt resumed tail — start once more from scratch
+            restarted = True
+            last_error = DownloadError(f"sha mismatch for {dest.name}")
+            continue
+
+        os.replace(part, dest)
+        return transferred
+
+    raise DownloadError(f"failed to download {dest.name}: {last_error}")
+
+
+def copy_file(url, dest, sha=None, size=None, progress=None):
+    """
+    download_file() for a file:// url (a shared preset directory): the same
+    .part file, verification and os.replace, without HTTP.
+    Returns the number of bytes copied. Raises DownloadError.
+    """
+    dest = Path(dest)
+    src = file_url_path(url)
+    part = _part_path(dest, sha)
+    _remove_stale_parts(dest, part)
+
+    copied = 0
+    try:
+        with open(src, "rb") as fin, open(part, "wb") as fout:
+            for chunk in iter(lambda: fin.read(CHUNK_SIZE), b""):
+                fout.write(chunk)
+                copied += len(chunk)
+                if progress is not None:
+                    progress(len(chunk))
+    except OSError as e:
+        part.unlink(missing_ok=True)
+        raise DownloadError(f"could not copy {dest.name} from {src}: {e}")
+
+    if (size is not None and copied != size) or (sha and git_blob_sha(part) != sha):
+        part.unlink(missing_ok=True)
+        raise DownloadError(f"{src} does not match the expected {dest.name}")
+
+    os.replace(part, dest)
+    return copied
+
+
+def _fetch_mirrored(url, dest, sha, size, progress):
+    if url.startswith("file:"):
+        return copy_file(url, dest, sha=sha, size=size, progress=progress)
+    # One attempt: a mirror that drops out is skipped, not retried
+    return download_file(url, dest, sha=sha, size=size, attempts=1, progress=progress)
+
+
+def download_delta(url, dest, signature_url, sha, timeout=(3, 30), progress=None):
+    """
+    Update an existing dest in place from its published block signature,
+    fetching only the byte ranges that changed. Raises DeltaError or
+    requests.RequestException when the caller should fall back to
+    download_file(). Returns the number of bytes transferred.
+    """
+    session = get_session()
+    r = session.get(signature_url, timeout=timeout)
+    r.raise_for_status()
+    signature = r.json()
+    if sha and signature.get("sha") != sha:
+        raise DeltaError("signature does not describe the expected file")
+
+    fetched, reused = apply_delta(
+        session, url, dest, dest, signature, timeout=timeout, progress=progress
+    )
+    total = fetched + reused
+    log.debug(
+        "Delta update of %s: fetched %s of %s bytes, %s bytes saved (%s%%)",
+        Path(dest).name,
+        fetched,
+        total,
+        reused,
+        reused * 100 // max(total, 1),
+    )
+    return fetched
+
+
+def _decompressor(codec):
+    if codec == "gz":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if codec == "xz":
+        return lzma.LZMADecompressor()
+    if codec == "zst" and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompressobj()
+    return None
+
+
+def pick_compressed(name, listing):
+    """
+    Return the preferred compressed sibling of name in a contents listing as
+    {"url", "codec", "size"}, or None if there is none we can decompress.
+    """
+    by_name = {item["name"]: item for item in listing}
+    for suffix, codec in COMPRESSED_SUFFIXES.items():
+        item = by_name.get(name + suffix)
+        if item and (codec != "zst" or zstandard is not None):
+            return {"url": item["download_url"], "codec": codec, "size": item.get("size")}
+    return None
+
+
+def download_compressed(url, dest, codec, sha=None, size=None, timeout=(3, 30), progress=None):
+    """
+    Download a compressed artifact and decompress it chunk by chunk straight
+    into a .part file next to dest, hashing the output on the fly, so the
+    file is never held in memory. dest is replaced only after the
+    decompressed bytes match the expected size and git blob sha.
+    Returns the number of (compressed) bytes transferred.
+    """
+    import requests
+
+    dest = Path(dest)
+    part = dest.with_name(f"{dest.name}.{codec}.part")
+    decompressor = _decompressor(codec)
+    if decompressor is None:
+        raise DownloadError(f"no decompressor available for .{codec}")
+
+    h = hashlib.sha1(b"blob %d\0" % size) if size is not None else None
+    transferred = written = 0
+    start = time.perf_counter()
+
+    try:
+        with get_session().get(url, stream=True, timeout=timeout) as r, open(part, "wb") as f:
+            r.raise_for_status()
+            for chunk in r.iter_content(chunk_size=CHUNK_SIZE):
+                limiter.consume(len(chunk))
+                transferred += len(chunk)
+                if progress is not None:
+                    progress(len(chunk))
+                out = decompressor.decompress(chunk)
+                if out:
+                    f.write(out)
+                    written += len(out)
+                    if h is not None:
+                        h.update(out)
+            if hasattr(decompressor, "flush"):
+                out = decompressor.flush()
+                f.write(out)
+                written += len(out)
+                if h is not None:
+                    h.update(out)
+    except (requests.RequestException, OSError, zlib.error, lzma.LZMAError) + _ZSTD_ERRORS as e:
+        part.unlink(missing_ok=True)
+        raise DownloadError(f"compressed download of {dest.name} failed: {e}")
+    except BaseException:
+        # e.g. JobCancelled from progress; a decompressed part is never resumed
+        part.unlink(missing_ok=True)
+        raise
+
+    elapsed = max(time.perf_counter() - start, 1e-6)
+
+    if size is not None and written != size:
+        part.unlink(missing_ok=True)
+        raise DownloadError(f"size mismatch for {dest.name}: {written} != {size}")
+    if sha and (h.hexdigest() if h is not None else git_blob_sha(part)) != sha:
+        part.unlink(missing_ok=True)
+        raise DownloadError(f"sha mismatch for {dest.name}")
+
+    os.replace(part, dest)
+    log.debug(
+        "%s: %s bytes .%s -> %s bytes (ratio %.2f), %.1f MB/s decompressed",
+        dest.name,
+        transferred,
+        codec,
+        written,
+        written / max(transferred, 1),
+        written / elapsed / 1e6,
+    )
+    return transferred
+
+
+def _download_artifact(a, progress=None):
+    """
+    download_file() for one artifact, trying first its mirrors in priority
+    order, then a delta update and a compressed sibling when they are offered.
+    """
+    import requests
+
+    dest = Path(a["dest"])
+    for url in a.get("mirrors") or ():
+        try:
+            return _fetch_mirrored(url, dest, a.get("sha"), a.get("size"), progress)
+        except DownloadError as e:
+            log.debug("Mirror %s skipped: %s", url, e)
+
+    if a.get("signature") and dest.exists():
+        try:
+            return download_delta(a["url"], dest, a["signature"], a.get("sha"), progress=progress)
+        except (DeltaError, requests.RequestException, ValueError) as e:
+            log.debug("Delta update of %s not possible, downloading in full: %s", dest.name, e)
+
+    compressed = a.get("compressed")
+    if compressed:
+        try:
+            return download_compressed(
+                compressed["url"],
+                dest,
+                compressed["codec"],
+                sha=a.get("sha"),
+                size=a.get("size"),
+                progress=progress,
+            )
+        except DownloadError as e:
+            log.debug("%s, falling back to the plain file", e)
+
+    if a["url"].startswith("file:"):
+        return copy_file(a["url"], dest, sha=a.get("sha"), size=a.get("size"), progress=progress)
+    return download_file(a["url"], dest, sha=a.get("sha"), size=a.get("size"), progress=progress)
+
+
+def download_many(artifacts, progress=None):
+    """
+    Fetch several artifacts concurrently, at most MAX_WORKERS at a time
+    across the whole add-on.
+    artifacts is a list of dicts with url, dest and optional sha / size /
+    mirrors (http(s) or file:// urls of the same file, tried first) /
+    signature (URL of a published block signature for delta updates) /
+    compressed (a pick_compressed() result).
+    Each file goes through download_file(), so text files are streamed as
+    raw bytes exactly like the .blend. Wall time is roughly that of the
+    largest artifact instead of the sum of all of them.
+    progress is passed on to every download (it may be called from
+    several threads at once).
+    Returns {dest: error or None}.
+    """
+    results = {}
+    slots = _slots
+
+    def _run(a):
+        try:
+            with slots:
+                _download_artifact(a, progress)
+            results[a["dest"]] = None
+        except Exception as e:
+            results[a["dest"]] = e
+
+    # Daemon threads, so an unfinished download never blocks Blender quitting;
+    # the .part file is resumed next time
+    threads = [
+        threading.Thread(target=_run, args=(a,), name=f"BRD_Download_{Path(a['dest']).name}", daemon=True)
+        for a in artifacts
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from pathlib import Path, PurePath
 from typing import List
 
@@ -17,21 +17,51 @@ class __DYN__:
     New: bool
     Debug: bool
     sha: str
+    File_Location: str = ""
+    # Update scheduler state, see Scheduler.py
+    Last_Check: float = 0
+    Failures: int = 0
+    Next_Attempt: float = 0
+    Breaker_Open_Until: float = 0
+    Breaker_Reason: str = ""
+
+    @classmethod
+    def from_dict(cls, data):
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in names})
 
 
 @dataclass
 class BRD_Datas:
     Package_name: str
-    Socials: List[Social]
-    Repository: str
     Folder: Path
-    __DYN__: __DYN__
+    Local_Version: str
+    # Settings store; settings.json is only read on first access below
+    Settings: object
+
+    @property
+    def Socials(self) -> List[Social]:
+        return [Social(**i) for i in self.Settings.get("Socials", default=[])]
+
+    @property
+    def Repository(self) -> str:
+        repo = self.Settings.get("Github", "Repository")
+        return f"https://api.github.com/repos/{repo}/contents/{self.Local_Version}"
+
+    @property
+    def __DYN__(self) -> __DYN__:
+        return self.Settings.dyn
+
+    def B_Version(self) -> str:
+        # Until a preset has been resolved, assume the local Blender version
+        version = self.__DYN__.B_Version
+        return self.Local_Version if version == "__" else version
 
     def File_Location(self) -> Path:
         return Path(
             PurePath(
                 self.Folder,
-                self.__DYN__.B_Version,
+                self.B_Version(),
                 "preset.blend",
             )
         )
@@ -0,0 +1,88 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+from .Logger import log
+from .utils import git_blob_sha
+
+
+class HashIndex:
+    """
+    Local git-blob SHA-1 index of downloaded files, kept in Data/hash_index.json.
+    Each entry is keyed by path and stamped with (size, mtime_ns, inode), so
+    as long as a file is untouched a later startup only needs a stat() to
+    know its hash. Any modification, partial write or swap changes the stamp
+    and forces a re-hash of the real bytes on disk.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._entries = None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                with open(self.path, "r") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    @staticmethod
+    def _stamp(st):
+        return [st.st_size, st.st_mtime_ns, st.st_ino]
+
+    def sha_of(self, file):
+        """Return the git blob sha of file, or None if it does not exist."""
+        file = Path(file)
+        try:
+            st = file.stat()
+        except OSError:
+            return None
+
+        key = str(file)
+        stamp = self._stamp(st)
+        with self._lock:
+            entry = self._load().get(key)
+            if entry and entry["stamp"] == stamp:
+                return entry["sha"]
+
+        sha = git_blob_sha(file)
+        with self._lock:
+            self._load()[key] = {"stamp": stamp, "sha": sha}
+            self._dirty = True
+        return sha
+
+    def record(self, file, sha):
+        """Remember the sha of a file that was just written and verified."""
+        file = Path(file)
+        try:
+            st = file.stat()
+        except OSError:
+            return
+        with self._lock:
+            self._load()[str(file)] = {"stamp": self._stamp(st), "sha": sha}
+            self._dirty = True
+
+    def matches(self, file, sha):
+        return bool(sha) and self.sha_of(file) == sha
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            # Forget files that no longer exist (e.g. removed version folders)
+            self._entries = {
+                k: v for k, v in self._entries.items() if os.path.exists(k)
+            }
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            try:
+                with open(tmp, "w") as f:
+                    f.write(json.dumps(self._entries))
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError as e:
+                log.warning("Could not write hash index: %s", e)
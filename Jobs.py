@@ -0,0 +1,181 @@
+import atexit
+import queue
+import threading
+
+import bpy
+
+from .Logger import log
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    """
+    Handle shared between a worker and the UI.
+    The worker reports its phase and byte progress here and calls check()
+    (or add_bytes(), which checks too) often enough to notice cancellation.
+    """
+
+    def __init__(self, key, label):
+        self.key = key
+        self.label = label
+        self.phase = "Queued"
+        self.done_bytes = 0
+        self.total_bytes = 0
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled(self.key)
+
+    def set_phase(self, phase, total_bytes=None):
+        self.check()
+        with self._lock:
+            self.phase = phase
+            if total_bytes is not None:
+                self.total_bytes = total_bytes
+                self.done_bytes = 0
+
+    def add_bytes(self, n):
+        """Progress callback for downloads; raises JobCancelled when cancelled."""
+        self.check()
+        with self._lock:
+            self.done_bytes += n
+
+    def factor(self):
+        with self._lock:
+            if not self.total_bytes:
+                return 0.0
+            return min(self.done_bytes / self.total_bytes, 1.0)
+
+
+class JobEngine:
+    """
+    Runs network and file I/O on a small pool of daemon worker threads
+    (daemon, so a stalled download can never keep Blender from quitting)
+    and hands results back to Blender's main thread.
+
+    Workers never touch bpy: a finished job is put on a completion queue
+    that a bpy.app.timers callback drains on the main thread, where its
+    on_done(job, result, error) callback may use bpy freely. Only one job
+    per key can be queued or running at a time.
+    """
+
+    DRAIN_INTERVAL = 0.1
+
+    def __init__(self, workers=2):
+        self._slots = threading.BoundedSemaphore(workers)
+        self._jobs = {}
+        self._done = queue.Queue()
+        self._lock = threading.Lock()
+
+    def submit(self, key, label, func, on_done=None):
+        """
+        Run func(job) on a worker. Returns the new Job, or None if a job
+        with the same key is still active.
+        """
+        with self._lock:
+            if key in self._jobs:
+                return None
+            job = Job(key, label)
+            self._jobs[key] = job
+
+        def run():
+            result = error = None
+            try:
+                with self._slots:
+                    result = func(job)
+            except JobCancelled:
+                log.debug("Job %s cancelled", key)
+            except Exception as e:
+                error = e
+                log.error("%s failed: %s", label, e)
+            if job.cancelled:
+                # Nothing to hand back; cancel_all() may have stopped the
+                # drain timer, so free the key here
+                self._release(job)
+                return
+            self._done.put((job, result, error, on_done))
+
+        threading.Thread(target=run, name=f"BRD_Job_{key}", daemon=True).start()
+        if not bpy.app.timers.is_registered(self._drain):
+            bpy.app.timers.register(self._drain, first_interval=self.DRAIN_INTERVAL)
+        return job
+
+    def active(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def _release(self, job):
+        with self._lock:
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+
+    def _drain(self):
+        """bpy.app.timers callback, always on the main thread."""
+        while True:
+            try:
+                job, result, error, on_done = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self._release(job)
+            if on_done is not None and not job.cancelled:
+                try:
+                    on_done(job, result, error)
+                except Exception as e:
+                    log.error("%s completion failed: %s", job.label, e)
+
+        _redraw_preferences()
+
+        with self._lock:
+            busy = bool(self._jobs)
+        # Returning None unregisters the timer until the next submit()
+        return self.DRAIN_INTERVAL if busy or not self._done.empty() else None
+
+    def cancel_all(self):
+        """
+        Cancel every job; used on unregister and when Blender quits.
+        A cancelled job keeps its key until its worker has stopped, so
+        re-enabling the add-on meanwhile cannot start a second update.
+        """
+        for job in self.active():
+            job.cancel()
+        if bpy.app.timers.is_registered(self._drain):
+            bpy.app.timers.unregister(self._drain)
+
+
+def _redraw_preferences():
+    wm = getattr(bpy.context, "window_manager", None)
+    if wm is None:
+        return
+    for window in wm.windows:
+        for area in window.screen.areas:
+            if area.type == "PREFERENCES":
+                area.tag_redraw()
+
+
+jobs = JobEngine()
+
+
+def _cancel_on_exit():
+    # Blender has no quit handler; atexit runs while the interpreter shuts
+    # down, too late for bpy.app.timers, so only flag the workers
+    for job in jobs.active():
+        job.cancel()
+
+
+atexit.register(_cancel_on_exit)
@@ -0,0 +1,231 @@
+import atexit
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+
+from .Logger import log
+
+
+# A lock or lease whose file was not touched for this long is abandoned
+STALE_AFTER = 30.0
+HEARTBEAT = 5.0
+
+_HOST = socket.gethostname()
+
+
+def _pid_alive(pid):
+    """True / False for a process on this host, None when it can't be told."""
+    if sys.platform == "win32":
+        # os.kill(pid, 0) would send CTRL_C_EVENT on Windows
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return None
+    return True
+
+
+def _is_stale(path, owner):
+    """owner is the parsed lock / lease file content (may be empty)."""
+    if owner.get("host") == _HOST and owner.get("pid") not in (None, os.getpid()):
+        alive = _pid_alive(owner["pid"])
+        if alive is not None:
+            return not alive
+    try:
+        return time.time() - path.stat().st_mtime > STALE_AFTER
+    except FileNotFoundError:
+        return False
+
+
+def _read_owner(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        # Being written right now or already gone
+        return {}
+
+
+class _Heartbeat:
+    """One daemon thread refreshing the mtime of every lock and lease we hold."""
+
+    def __init__(self):
+        self._paths = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def add(self, path):
+        with self._lock:
+            self._paths.add(path)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="BRD_Heartbeat", daemon=True)
+                self._thread.start()
+
+    def discard(self, path):
+        with self._lock:
+            self._paths.discard(path)
+
+    def _run(self):
+        while True:
+            time.sleep(HEARTBEAT)
+            with self._lock:
+                paths = list(self._paths)
+            for path in paths:
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+
+
+_heartbeat = _Heartbeat()
+
+
+def _owner_record():
+    return json.dumps({"pid": os.getpid(), "host": _HOST, "started": time.time()})
+
+
+class ProcessLock:
+    """
+    Lock file shared by every Blender instance using the same Data/ folder
+    (also across machines on a network share). Created with O_EXCL and
+    kept alive by a heartbeat while held; a lock whose holder died, or
+    that was not refreshed for STALE_AFTER seconds, is taken over.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.held = False
+
+    def acquire(self):
+        """Take the lock if it is free or stale. Never blocks."""
+        for _ in range(2):
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._break_stale():
+                    return False
+                continue
+            with os.fdopen(fd, "w") as f:
+                f.write(_owner_record())
+            self.held = True
+            _heartbeat.add(self.path)
+            return True
+        return False
+
+    def _break_stale(self):
+        owner = _read_owner(self.path)
+        if not _is_stale(self.path, owner):
+            return False
+        # Renaming is atomic: of several processes finding the same stale
+        # lock only one moves it away, the others see it gone
+        grave = self.path.with_name(f"{self.path.name}.stale.{os.getpid()}")
+        try:
+            os.replace(self.path, grave)
+        except FileNotFoundError:
+            return True
+        if _read_owner(grave) != owner:
+            # Someone recovered it first and we moved their fresh lock:
+            # put it back unless yet another one was created meanwhile
+            try:
+                os.link(grave, self.path)
+            except OSError:
+                pass
+            grave.unlink(missing_ok=True)
+            return False
+        log.debug("Recovered stale lock of %s:%s", owner.get("host"), owner.get("pid"))
+        grave.unlink(missing_ok=True)
+        return True
+
+    def release(self):
+        if not self.held:
+            return
+        _heartbeat.discard(self.path)
+        self.held = False
+        if _read_owner(self.path).get("pid") == os.getpid():
+            self.path.unlink(missing_ok=True)
+
+    def holder(self):
+        """The owner record of the lock, or None if it is free."""
+        return _read_owner(self.path) if self.path.exists() else None
+
+    def wait(self, poll=0.5, check=None):
+        """
+        Block until the lock is released or its holder went stale.
+        check, if given, is called every poll (e.g. Job.check, to abort).
+        """
+        while self.path.exists():
+            if _is_stale(self.path, _read_owner(self.path)):
+                return
+            if check is not None:
+                check()
+            time.sleep(poll)
+
+
+class Leases:
+    """
+    Reader leases on the version folders of Data/. Every instance holds a
+    lease on the folder it uses, so no other instance removes it while it
+    is loaded. Leases are files in Data/.leases kept alive by the heartbeat.
+    """
+
+    def __init__(self, folder):
+        self.folder = Path(folder) / ".leases"
+        self._held = {}
+
+    def _path(self, name):
+        return self.folder / f"{name}@{_HOST}-{os.getpid()}"
+
+    def hold(self, name):
+        if name in self._held:
+            return
+        path = self._path(name)
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            with open(path, "w") as f:
+                f.write(_owner_record())
+        except OSError as e:
+            log.warning("Could not take lease on %s: %s", name, e)
+            return
+        self._held[name] = path
+        _heartbeat.add(path)
+
+    def release(self, name):
+        path = self._held.pop(name, None)
+        if path is not None:
+            _heartbeat.discard(path)
+            path.unlink(missing_ok=True)
+
+    def release_all(self):
+        for name in list(self._held):
+            self.release(name)
+
+    def in_use(self, name):
+        """True if another live instance holds a lease on name."""
+        if not self.folder.exists():
+            return False
+        for path in self.folder.glob(f"{name}@*"):
+            if path == self._held.get(name):
+                continue
+            if _is_stale(path, _read_owner(path)):
+                path.unlink(missing_ok=True)
+                continue
+            return True
+        return False
+
+
+def _release_on_exit(lock, leases):
+    lock.release()
+    leases.release_all()
+
+
+def release_at_exit(lock, leases):
+    """Drop the lock and all leases of this process when Blender quits."""
+    atexit.register(_release_on_exit, lock, leases)
@@ -1,7 +1,12 @@
-from .constants import BRD_CONST_DATA
-import time
+from .constants import BRD_CONST_DATA, settings
+import atexit
+import json
+import os
+import queue
 import sys
-from pathlib import Path, PurePath
+import threading
+import time
+from pathlib import Path
 
 
 class bcolors:
@@ -16,47 +21,184 @@ class bcolors:
     UNDERLINE = "\033[4m"
 
 
-from inspect import getouterframes
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+_LEVELS = {
+    DEBUG: ("DEBUG", bcolors.WARNING),
+    INFO: ("INFO", bcolors.OKCYAN),
+    WARNING: ("WARNING", bcolors.WARNING + bcolors.BOLD),
+    ERROR: ("ERROR", bcolors.FAIL),
+}
 
+# code object -> "bradley.<module>", so a caller is looked up once
+_callers = {}
 
-def stack():
-    """Return a list of records for the stack above the caller's frame."""
-    (frame, source, lineno, func, lines, index) = getouterframes(sys._getframe(1), 1)[
-        -1
-    ]
-    return "bradley." + Path(source).stem
+
+def _caller(frame):
+    code = frame.f_code
+    name = _callers.get(code)
+    if name is None:
+        name = _callers[code] = "bradley." + Path(code.co_filename).stem
+    return name
 
 
 class Logging:
-    def debug(self, message, multi_line=False):
+    """
+    Levelled logger for the add-on.
+    Messages use lazy %-style formatting (log.debug("got %s", x)), so a
+    disabled level costs one comparison and no string building; an
+    argument that is costly to build is passed as a callable without
+    arguments and only called when the record is kept. Records
+    are queued and written by a daemon thread, so the background update
+    never waits on console or file I/O. With Logging.File set in
+    settings.json every record is also appended as a JSON line to
+    Data/logs/brd.jsonl, rotated at Logging.Max_KB.
+    """
 
-        if BRD_CONST_DATA.__DYN__.Debug:
+    def __init__(self):
+        # Resolved from the Debug setting on first use, see set_debug()
+        self.level = None
+        self._queue = queue.SimpleQueue()
+        self._worker = None
+        self._start_lock = threading.Lock()
+        self._file = None
+        self._file_config = None
 
-            tm = (
-                time.strftime("%d-%m-%Y %H:%M:%S")
-                + ":"
-                + str(round(time.time() * 1000))
-            )
-            msg = (
-                message
-                if not multi_line
-                else "↓ ------------ ↓\n" + message + "\n↑ ------------ ↑"
-            )
-            print(
-                bcolors.OKGREEN
-                + f"[{tm}]"
-                + bcolors.ENDC
-                + " | "
-                + bcolors.WARNING
-                + "DEBUG"
-                + bcolors.ENDC
-                + " | "
-                + bcolors.OKBLUE
-                + str(stack())
-                + bcolors.ENDC
-                + " | "
-                + msg
+    def set_debug(self, enabled):
+        self.level = DEBUG if enabled else INFO
+
+    def is_enabled(self, level):
+        if self.level is None:
+            self.set_debug(BRD_CONST_DATA.__DYN__.Debug)
+        return level >= self.level
+
+    def debug(self, message, *args, multi_line=False):
+        if self.level is None or self.level <= DEBUG:
+            self._log(DEBUG, message, args, multi_line)
+
+    def info(self, message, *args, multi_line=False):
+        self._log(INFO, message, args, multi_line)
+
+    def warning(self, message, *args, multi_line=False):
+        self._log(WARNING, message, args, multi_line)
+
+    def error(self, message, *args, multi_line=False):
+        self._log(ERROR, message, args, multi_line)
+
+    def _log(self, level, message, args, multi_line):
+        if not self.is_enabled(level):
+            return
+        if args:
+            args = tuple(a() if callable(a) else a for a in args)
+            # Formatted here so later changes to args don't leak into the record
+            try:
+                message = message % args
+            except (TypeError, ValueError):
+                message = f"{message} {args!r}"
+        # 0 is _log, 1 the level method, 2 its caller
+        self._queue.put((time.time(), level, _caller(sys._getframe(2)), message, multi_line))
+        if self._worker is None:
+            self._start()
+
+    def _start(self):
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="BRD_Logger", daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            self._write_safe(self._queue.get())
+
+    def flush(self):
+        """Write out everything still queued, on the calling thread."""
+        while True:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._write_safe(record)
+
+    def _write_safe(self, record):
+        # A record that can't be written (console encoding, closed stdout)
+        # must not end the worker, every later record would stay queued
+        try:
+            self._write(record)
+        except Exception as e:
+            try:
+                sys.__stderr__.write(f"BRD: Could not write log record {record[3]!r}: {e}\n")
+            except Exception:
+                pass
+
+    def _write(self, record):
+        ts, level, caller, message, multi_line = record
+        name, color = _LEVELS[level]
+
+        tm = time.strftime("%d-%m-%Y %H:%M:%S", time.localtime(ts)) + ":" + str(round(ts * 1000))
+        msg = (
+            message
+            if not multi_line
+            else "↓ ------------ ↓\n" + message + "\n↑ ------------ ↑"
+        )
+        print(
+            bcolors.OKGREEN
+            + f"[{tm}]"
+            + bcolors.ENDC
+            + " | "
+            + color
+            + name
+            + bcolors.ENDC
+            + " | "
+            + bcolors.OKBLUE
+            + caller
+            + bcolors.ENDC
+            + " | "
+            + msg
+        )
+
+        if self._file_config is None:
+            self._configure_file()
+        if self._file is not None:
+            self._append(
+                json.dumps({"ts": ts, "level": name, "module": caller, "msg": message}) + "\n"
             )
 
+    def _configure_file(self):
+        config = settings.get("Logging", default={})
+        self._file_config = config
+        if config.get("File"):
+            self._file = BRD_CONST_DATA.Folder / "logs" / "brd.jsonl"
+
+    def _append(self, line):
+        path = self._file
+        max_bytes = self._file_config.get("Max_KB", 1024) << 10
+        try:
+            path.parent.mkdir(exist_ok=True)
+            if path.exists() and path.stat().st_size + len(line) > max_bytes:
+                self._rotate(path, self._file_config.get("Backups", 3))
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(line)
+        except OSError as e:
+            print(f"BRD: Log file disabled: {e}")
+            self._file = None
+
+    @staticmethod
+    def _rotate(path, backups):
+        # brd.jsonl -> brd.jsonl.1 -> ... -> brd.jsonl.<backups>, oldest dropped
+        for i in range(backups - 1, 0, -1):
+            older = path.with_name(f"{path.name}.{i}")
+            if older.exists():
+                os.replace(older, path.with_name(f"{path.name}.{i + 1}"))
+        if backups:
+            os.replace(path, path.with_name(f"{path.name}.1"))
+        else:
+            path.unlink()
+
 
 log = Logging()
+
+# The worker is a daemon thread, write out what it did not get to
+atexit.register(log.flush)
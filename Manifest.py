@@ -0,0 +1,140 @@
+"""
+Static update manifest.
+
+The preset repository publishes one `manifest.json` at its root, served
+from the raw content host, that describes everything an update needs:
+
+    {
+        "version": 1,
+        "versions": {
+            "5.2": [
+                {"name": "preset.blend", "size": 123, "sha": "<git blob sha>", "url": "..."},
+                ...
+            ]
+        }
+    }
+
+"url" is optional and defaults to <folder of manifest.json>/<version>/<name>.
+Files of the per-catalog layout live in <version>/catalogs/ and carry the
+catalog they hold, {"name": "catalogs/<uuid>.blend", "catalog": "<uuid>"}
+(see Catalogs.py).
+A single GET of this file (not rate limited, revalidated with its ETag)
+replaces the rate limit probe and both GitHub contents API listings.
+
+This module only depends on the standard library (and utils, which loads
+requests lazily) so it can also be used to publish the manifest outside
+Blender (see build_manifest()).
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+from .utils import git_blob_sha
+
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+_VERSION_DIR = re.compile(r"^-?\d+(?:\.\d+)$")
+_CATALOG_FILE = re.compile(r"^[0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12}\.blend$")
+
+
+class ManifestError(Exception):
+    pass
+
+
+def load(body, url):
+    """
+    Validate a parsed manifest fetched from url and return it with every
+    entry in GitHub contents API shape (name, sha, size, download_url), so
+    callers can treat it exactly like a contents listing, plus its catalog
+    (None outside of the per-catalog layout).
+    """
+    if not isinstance(body, dict) or body.get("version") != MANIFEST_VERSION:
+        raise ManifestError("unsupported manifest version")
+
+    versions = body.get("versions")
+    if not isinstance(versions, dict) or not versions:
+        raise ManifestError("manifest lists no versions")
+
+    base = url.rsplit("/", 1)[0]
+    resolved = {}
+    for version, files in versions.items():
+        if not _VERSION_DIR.match(version) or not isinstance(files, list):
+            raise ManifestError(f"bad entry for version {version!r}")
+        items = []
+        for entry in files:
+            try:
+                name = entry["name"]
+                items.append(
+                    {
+                        "name": name,
+                        "sha": entry["sha"],
+                        "size": int(entry["size"]),
+                        "download_url": entry.get("url") or f"{base}/{version}/{name}",
+                        "catalog": entry.get("catalog"),
+                    }
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                raise ManifestError(f"bad file entry in version {version}: {e}")
+        resolved[version] = items
+
+    return {"version": MANIFEST_VERSION, "versions": resolved}
+
+
+def versions(manifest):
+    return list(manifest["versions"])
+
+
+def listing(manifest, version):
+    """Files of version (e.g. "5.2"), or an empty list if it is not listed."""
+    for key, items in manifest["versions"].items():
+        if float(key) == float(version):
+            return items
+    return []
+
+
+def build_manifest(root, base_url=None):
+    """
+    Return the manifest for a checkout of the preset repository at root:
+    every file of every version folder, and the <uuid>.blend files of its
+    catalogs/ folder. Without base_url the download urls are left out and
+    derived from the manifest location by clients.
+    """
+    root = Path(root)
+    result = {}
+    for folder in sorted(root.iterdir()):
+        if not folder.is_dir() or not _VERSION_DIR.match(folder.name):
+            continue
+        # Top level files first: older clients take the first .blend listed
+        paths = sorted(p for p in folder.iterdir() if p.is_file())
+        catalogs = folder / "catalogs"
+        if catalogs.is_dir():
+            paths += sorted(p for p in catalogs.iterdir() if _CATALOG_FILE.match(p.name))
+
+        files = []
+        for path in paths:
+            if path.suffix in (".part", ".tmp"):
+                continue
+            name = path.relative_to(folder).as_posix()
+            entry = {"name": name, "size": path.stat().st_size, "sha": git_blob_sha(path)}
+            if path.parent == catalogs:
+                entry["catalog"] = path.stem
+            if base_url:
+                entry["url"] = f"{base_url.rstrip('/')}/{folder.name}/{name}"
+            files.append(entry)
+        result[folder.name] = files
+    return {"version": MANIFEST_VERSION, "versions": result}
+
+
+def write_manifest(root, base_url=None):
+    """Write manifest.json at the root of the checkout and return its location."""
+    out = Path(root) / MANIFEST_NAME
+    # Swapped in atomically, clients may be reading the old one right now
+    tmp = out.with_name(MANIFEST_NAME + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(build_manifest(root, base_url), f, indent=4)
+    os.replace(tmp, out)
+    return out
@@ -0,0 +1,221 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from pathlib import Path
+
+from .constants import BRD_CONST_DATA, settings
+from .Logger import log
+
+
+_NULL_SPAN = nullcontext()
+
+
+class Run:
+    """Spans, counters and gauges of one instrumented operation (e.g. an update)."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.started = time.time()
+        self.spans = []
+        self.counters = {}
+        self.gauges = {}
+        self.depth = 0
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def count(self, key, n=1):
+        # Also called from download threads
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def set(self, key, value):
+        with self._lock:
+            self.gauges[key] = value
+
+    def record(self):
+        return {
+            "kind": self.kind,
+            "started": self.started,
+            "ms": round((time.perf_counter() - self._t0) * 1000, 3),
+            "spans": [s for s in self.spans if s is not None],
+            "counters": self.counters,
+            "gauges": self.gauges,
+        }
+
+
+class _Span:
+    __slots__ = ("run", "name", "index", "t0")
+
+    def __init__(self, run, name):
+        self.run = run
+        self.name = name
+
+    def __enter__(self):
+        run = self.run
+        # Reserve the slot now so spans are listed in start order
+        self.index = len(run.spans)
+        run.spans.append(None)
+        run.depth += 1
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc):
+        run = self.run
+        run.depth -= 1
+        run.spans[self.index] = {
+            "name": self.name,
+            "depth": run.depth,
+            "ms": round((time.perf_counter() - self.t0) * 1000, 3),
+        }
+
+
+class Metrics:
+    """
+    Instrumentation of the startup and update pipeline.
+    A run() collects nested timing spans, counters (bytes, cache hits) and
+    gauges (remaining API quota) of one operation on the calling thread;
+    the last Metrics.Keep runs are kept in Data/metrics.json.
+    Enabled with Metrics.Enabled in settings.json. Outside of a recorded
+    run every call is a thread-local lookup and nothing else.
+    """
+
+    def __init__(self, path, settings):
+        self.path = Path(path)
+        self.settings = settings
+        self.enabled = None
+        self._runs = None
+        self._register_ms = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def is_enabled(self):
+        if self.enabled is None:
+            self.enabled = bool(self.settings.get("Metrics", "Enabled", default=False))
+        return self.enabled
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.settings.update("Metrics", Enabled=enabled)
+
+    def note_register(self, ms):
+        """register() runs before settings may be read; kept for the next run."""
+        self._register_ms = round(ms, 3)
+
+    @contextmanager
+    def run(self, kind):
+        if not self.is_enabled() or getattr(self._local, "run", None) is not None:
+            # Disabled, or nested in a run that already records
+            yield None
+            return
+
+        run = self._local.run = Run(kind)
+        if self._register_ms is not None:
+            run.spans.append({"name": "register", "depth": 0, "ms": self._register_ms})
+            self._register_ms = None
+        try:
+            yield run
+        finally:
+            self._local.run = None
+            self._store(run.record())
+
+    def recorded(self, kind):
+        """Decorator form of run()."""
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.run(kind):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def current(self):
+        return getattr(self._local, "run", None)
+
+    def span(self, name):
+        run = getattr(self._local, "run", None)
+        return _NULL_SPAN if run is None else _Span(run, name)
+
+    def timed(self, name):
+        """Decorator recording every call of the function as a span."""
+
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                run = getattr(self._local, "run", None)
+                if run is None:
+                    return func(*args, **kwargs)
+                with _Span(run, name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def count(self, key, n=1):
+        run = getattr(self._local, "run", None)
+        if run is not None:
+            run.count(key, n)
+
+    def set(self, key, value):
+        run = getattr(self._local, "run", None)
+        if run is not None:
+            run.set(key, value)
+
+    def _load(self):
+        if self._runs is None:
+            try:
+                with open(self.path, "r") as f:
+                    self._runs = json.load(f)
+            except (OSError, ValueError):
+                self._runs = []
+        return self._runs
+
+    def _store(self, record):
+        keep = self.settings.get("Metrics", "Keep", default=20)
+        with self._lock:
+            runs = self._load()
+            runs.append(record)
+            del runs[:-keep]
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            try:
+                with open(tmp, "w") as f:
+                    f.write(json.dumps(runs))
+                os.replace(tmp, self.path)
+            except OSError as e:
+                log.warning("Could not write metrics: %s", e)
+
+    def summary(self):
+        """Lines describing the latest run of each kind, for the preferences."""
+        with self._lock:
+            runs = list(self._load())
+
+        latest = {}
+        for record in runs:
+            latest[record["kind"]] = record
+
+        lines = []
+        for kind, record in latest.items():
+            text = f"{kind}: {record['ms']:.0f} ms"
+            counters = record["counters"]
+            if counters.get("bytes"):
+                text += f", {counters['bytes'] / 1e6:.1f} MB"
+            hits = counters.get("cache_hits", 0)
+            misses = counters.get("cache_misses", 0)
+            if hits or misses:
+                text += f", cache {hits}/{hits + misses}"
+            if "api_remaining" in record["gauges"]:
+                text += f", API quota {record['gauges']['api_remaining']}"
+            lines.append(text)
+
+            slowest = sorted(record["spans"], key=lambda s: s["ms"], reverse=True)[:3]
+            for s in slowest:
+                lines.append(f"    {s['name']}: {s['ms']:.1f} ms")
+        return lines
+
+
+metrics = Metrics(BRD_CONST_DATA.Folder / "metrics.json", settings)
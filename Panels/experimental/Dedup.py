@@ -0,0 +1,366 @@
+import bpy
+import hashlib
+import os
+import re
+from pathlib import Path
+from bpy.app.handlers import persistent
+
+from ...Catalogs import catalog_of
+from ...constants import BRD_CONST_DATA
+from ...Logger import log
+from .utils import Experimental_Poll, Experimental_Panel
+
+
+# Node properties every node has; only the type specific ones are hashed
+_BASE_NODE_PROPS = None
+_SUFFIX = re.compile(r"\.\d{3,}$")
+# UI state of curve points, ramp stops, ... that is not part of the data
+_STRUCT_SKIP = {"rna_type", "select"}
+# Structs nest a few levels (CurveMapping > CurveMap > CurveMapPoint)
+_STRUCT_DEPTH = 4
+
+# Bumped whenever tree_hash() changes, so stored fingerprints are redone
+HASH_VERSION = 2
+
+# session_uid -> (library stamp, own digest, nested session_uids) of linked
+# trees. Library data can't be edited, so their own part is only rehashed
+# when the library file changes; local trees are always hashed from their
+# current data. A digest is composed from the current digests of the nested
+# groups every time, so a changed nested group changes all that use it.
+_hash_cache = {}
+
+# Operators that bring node groups in from another file
+_APPEND_OPERATORS = {"WM_OT_append", "WM_OT_link", "NODE_OT_add_group_asset"}
+
+
+def _base_props():
+    global _BASE_NODE_PROPS
+    if _BASE_NODE_PROPS is None:
+        _BASE_NODE_PROPS = {p.identifier for p in bpy.types.Node.bl_rna.properties}
+        _BASE_NODE_PROPS.discard("mute")
+    return _BASE_NODE_PROPS
+
+
+def _struct_value(struct, nested, depth):
+    """Non-ID data a node points to (CurveMapping, ColorRamp, ...), from its RNA properties."""
+    parts = [struct.bl_rna.identifier]
+    if depth > _STRUCT_DEPTH:
+        return tuple(parts)
+    for p in struct.bl_rna.properties:
+        if p.identifier in _STRUCT_SKIP:
+            continue
+        value = getattr(struct, p.identifier)
+        if p.type == "COLLECTION":
+            parts.append((p.identifier, tuple(_value(i, nested, depth + 1) for i in value)))
+        else:
+            parts.append((p.identifier, _value(value, nested, depth + 1)))
+    return tuple(parts)
+
+
+def _value(value, nested, depth=0):
+    if isinstance(value, bpy.types.NodeTree):
+        # Stands in by position, its digest is added by tree_hash()
+        nested.append(value)
+        return ("group", len(nested) - 1)
+    if isinstance(value, bpy.types.ID):
+        # Plain name, so a linked and a localized copy fingerprint the same
+        return value.name
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, set):
+        return tuple(sorted(value))
+    if isinstance(value, bpy.types.bpy_struct):
+        return _struct_value(value, nested, depth)
+    try:
+        return tuple(_value(v, nested, depth) for v in value)
+    except TypeError:
+        # Never repr(): it holds RNA paths and addresses, not the data
+        return type(value).__name__
+
+
+def _own_digest(tree, nested):
+    """
+    Digest of the tree's own data: interface, node types and settings,
+    unlinked socket defaults and links. Nested groups are collected into
+    nested instead of being hashed here.
+    """
+    base = _base_props()
+    parts = [tree.bl_idname]
+
+    for item in tree.interface.items_tree:
+        parts.append(
+            (
+                item.item_type,
+                getattr(item, "in_out", None),
+                getattr(item, "socket_type", None),
+                item.name,
+                _value(getattr(item, "default_value", None), nested),
+                _value(getattr(item, "min_value", None), nested),
+                _value(getattr(item, "max_value", None), nested),
+            )
+        )
+
+    for node in sorted(tree.nodes, key=lambda n: n.name):
+        props = tuple(
+            (p.identifier, _value(getattr(node, p.identifier), nested))
+            for p in node.bl_rna.properties
+            if p.identifier not in base and p.type != "COLLECTION"
+        )
+        defaults = tuple(
+            (s.identifier, _value(s.default_value, nested))
+            for s in node.inputs
+            if not s.is_linked and hasattr(s, "default_value")
+        )
+        parts.append((node.name, node.bl_idname, node.mute, props, defaults))
+
+    parts.append(
+        tuple(
+            sorted(
+                (
+                    link.from_node.name,
+                    link.from_socket.identifier,
+                    link.to_node.name,
+                    link.to_socket.identifier,
+                    link.is_muted,
+                )
+                for link in tree.links
+            )
+        )
+    )
+
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def _library_stamp(library, memo):
+    key = ("library", library.session_uid)
+    if key not in memo:
+        path = bpy.path.abspath(library.filepath, library=library.parent)
+        try:
+            st = os.stat(path)
+            memo[key] = (path, st.st_size, st.st_mtime_ns)
+        except OSError:
+            memo[key] = (path, None, None)
+    return memo[key]
+
+
+def _cached_own(tree, memo):
+    """(own digest, nested trees) of a linked tree from _hash_cache, or None."""
+    cached = _hash_cache.get(tree.session_uid)
+    if cached is None or cached[0] != _library_stamp(tree.library, memo):
+        return None
+    if "trees" not in memo:
+        memo["trees"] = {g.session_uid: g for g in bpy.data.node_groups}
+    nested = [memo["trees"].get(uid) for uid in cached[2]]
+    if None in nested:
+        return None
+    return cached[1], nested
+
+
+def tree_hash(tree, memo=None):
+    """
+    Structural hash of a node tree: its own data (see _own_digest()) and,
+    recursively, nested groups. Names of nested groups are not part of it,
+    so G_Foo and an identical G_Foo.001 hash the same and so do the groups
+    that use either of them. memo shares work within one call.
+    """
+    memo = {} if memo is None else memo
+    key = tree.session_uid
+    if key in memo:
+        return memo[key]
+
+    cached = _cached_own(tree, memo) if tree.library is not None else None
+    if cached is not None:
+        own, nested = cached
+    else:
+        nested = []
+        own = _own_digest(tree, nested)
+        if tree.library is not None:
+            _hash_cache[key] = (
+                _library_stamp(tree.library, memo),
+                own,
+                [t.session_uid for t in nested],
+            )
+
+    h = hashlib.sha1(own.encode())
+    for child in nested:
+        h.update(tree_hash(child, memo).encode())
+    digest = h.hexdigest()
+    memo[key] = digest
+    return digest
+
+
+def _preset_groups():
+    return [
+        i
+        for i in bpy.data.node_groups
+        if i.name.startswith("G_") and i.type == "GEOMETRY"
+    ]
+
+
+def deduplicate(only=None):
+    """
+    Merge structurally identical copies of the same preset (G_Foo,
+    G_Foo.001, ...) into one, remap all users to it and remove the rest.
+    With only (a set of session_uids, e.g. the groups just appended), only
+    those groups are merged away, into a copy that was there before when
+    there is one; copies the user made on purpose are left alone.
+    Returns a list of (removed name, kept name).
+    """
+    # Only copies with the same name can merge, the rest is never hashed
+    by_name = {}
+    for tree in _preset_groups():
+        by_name.setdefault((tree.library, _SUFFIX.sub("", tree.name)), []).append(tree)
+
+    memo = {}
+    buckets = {}
+    for key, trees in by_name.items():
+        if len(trees) < 2:
+            continue
+        if only is not None and not any(t.session_uid in only for t in trees):
+            continue
+        for tree in trees:
+            buckets.setdefault(key + (tree_hash(tree, memo),), []).append(tree)
+
+    merged = []
+    for trees in buckets.values():
+        if len(trees) < 2:
+            continue
+        # Keep what was there before, then the un-suffixed original
+        trees.sort(
+            key=lambda t: (
+                only is not None and t.session_uid in only,
+                bool(_SUFFIX.search(t.name)),
+                t.name,
+            )
+        )
+        keep = trees[0]
+        for dup in trees[1:]:
+            if only is not None and dup.session_uid not in only:
+                continue
+            merged.append((dup.name, keep.name))
+            dup.user_remap(keep)
+            bpy.data.node_groups.remove(dup)
+
+    return merged
+
+
+def _dedup_on_append_enabled():
+    addon = bpy.context.preferences.addons.get(BRD_CONST_DATA.Package_name)
+    return addon is not None and addon.preferences.dedup_on_append
+
+
+def _deferred_dedup():
+    appended = set(_pending)
+    _pending.clear()
+    merged = deduplicate(only=appended)
+    if merged:
+        log.debug(
+            "Merged duplicates :\n%s",
+            lambda: "\n".join(f"- {a} -> {b}" for a, b in merged),
+            multi_line=True,
+        )
+    return None
+
+
+# session_uids of the node groups seen so far, and of the appended ones
+# waiting for _deferred_dedup()
+_known = {"count": 0, "uids": set(), "operator": None}
+_pending = set()
+
+
+def _is_preset_file(filepath):
+    return Path(filepath).name == "preset.blend" or catalog_of(filepath) is not None
+
+
+def _from_preset(tree):
+    """Linked from a preset file, or appended from one (asset "Append (Reuse Data)")."""
+    if tree.library is not None:
+        return _is_preset_file(tree.library.filepath)
+    ref = getattr(tree, "library_weak_reference", None)
+    return ref is not None and _is_preset_file(ref.filepath)
+
+
+def _new_append_operator():
+    """True if the last registered operator is an append or link run since the last call."""
+    wm = bpy.context.window_manager
+    operators = wm.operators if wm is not None else ()
+    last = operators[-1] if len(operators) else None
+    pointer = last.as_pointer() if last is not None else None
+    is_new = pointer != _known["operator"]
+    _known["operator"] = pointer
+    return is_new and last is not None and last.bl_idname in _APPEND_OPERATORS
+
+
+def reset_tracking():
+    """Called after a file is loaded: its own node groups are not an append."""
+    _known["count"] = len(bpy.data.node_groups)
+    _known["uids"] = {g.session_uid for g in bpy.data.node_groups}
+    _pending.clear()
+    _hash_cache.clear()
+    _new_append_operator()
+
+
+@persistent
+def on_depsgraph_update(scene, depsgraph):
+    # Cheap check first, this runs after every edit
+    count = len(bpy.data.node_groups)
+    if count == _known["count"]:
+        return
+    _known["count"] = count
+    groups = {g.session_uid: g for g in bpy.data.node_groups}
+    new = [g for uid, g in groups.items() if uid not in _known["uids"]]
+    _known["uids"] = set(groups)
+    if not new or not _dedup_on_append_enabled():
+        return
+
+    # Only real appends or links: a group the user duplicated to edit it
+    # (make single user, copy) must not be merged back
+    if not _new_append_operator():
+        new = [g for g in new if _from_preset(g)]
+    if not new:
+        return
+
+    # Dedup once the operation is done, data can't be removed from inside
+    # a depsgraph handler
+    _pending.update(g.session_uid for g in new)
+    if not bpy.app.timers.is_registered(_deferred_dedup):
+        bpy.app.timers.register(_deferred_dedup, first_interval=0.5)
+
+
+class BRD_Node_Dedup(Experimental_Poll, bpy.types.Operator):
+    bl_idname = "bradley.node_dedup"
+    bl_label = "Merge Duplicate Presets"
+    bl_description = "Merge identical copies of appended preset node groups (G_Foo.001, ...)"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+
+        merged = deduplicate()
+
+        log.debug(
+            "Merged duplicates :\n%s",
+            lambda: "\n".join(f"- {a} -> {b}" for a, b in merged),
+            multi_line=True,
+        )
+        self.report({"INFO"}, f"Merged {len(merged)} duplicate node groups")
+
+        return {"FINISHED"}
+
+
+class BRD_PT_Dedup(Experimental_Panel, bpy.types.Panel):
+    bl_idname = "BRD_PT_Dedup"
+    bl_label = "Deduplicate"
+
+    def draw(self, context):
+        layout = self.layout
+
+        col = layout.column()
+        col.operator("bradley.node_dedup", text="Merge Duplicates", icon="AUTOMERGE_ON")
+        col.prop(
+            context.preferences.addons[BRD_CONST_DATA.Package_name].preferences,
+            "dedup_on_append",
+            text="Merge on Append",
+        )
+
+
+dedup_panels = [BRD_Node_Dedup, BRD_PT_Dedup]
@@ -1,35 +1,70 @@
 import bpy
 from ...Logger import log
 from .utils import Experimental_Poll, Experimental_Panel
+from .Sync import stamp_upstream
+
+
+def _subgroups(tree):
+    return [n.node_tree for n in tree.nodes if getattr(n, "node_tree", None) is not None]
+
+
+def dependency_order(trees, children=_subgroups):
+    """
+    Every node group reachable from trees, each exactly once, with the
+    groups that use a nested group before it. make_local() leaves a group
+    alone while a linked group still uses it, so parents go first.
+    Iterative DFS with a visited set, so a subgroup reused many times is
+    only walked once: O(groups + group nodes) instead of one traversal per
+    occurrence.
+    """
+    order = []
+    visited = set()
+
+    for root in trees:
+        if root.name_full in visited:
+            continue
+        visited.add(root.name_full)
+        stack = [(root, iter(children(root)))]
+
+        while stack:
+            tree, pending = stack[-1]
+            for child in pending:
+                if child.name_full not in visited:
+                    visited.add(child.name_full)
+                    stack.append((child, iter(children(child))))
+                    break
+            else:
+                stack.pop()
+                order.append(tree)
+
+    # Post-order puts children first
+    order.reverse()
+    return order
+
+
+def _localize(trees):
+    for tree in trees:
+        tree = tree.make_local()
+        tree.use_fake_user = True
+        stamp_upstream(tree)
 
 
 class BRD_Node_Localizer(Experimental_Poll, bpy.types.Operator):
     bl_idname = "bradley.node_localize_used"
     bl_label = "Simple Node Operator"
 
-    noodles = []
-
-    def recursive_find(self, context):
-        for n in context.node_tree.nodes:
-            if hasattr(n, "node_tree"):
-                self.noodles.append(n.node_tree.name)
-                self.recursive_find(n)
-
     def execute(self, context):
 
-        tree = context.space_data
-        self.recursive_find(tree)
-
-        for i in self.noodles:
-            bpy.data.node_groups[str(i)].make_local()
-            bpy.data.node_groups[str(i)].use_fake_user = True
+        tree = context.space_data.node_tree
+        noodles = dependency_order(_subgroups(tree))
+        _localize(noodles)
 
         log.debug(
-            "Made Local :\n" + "\n".join(["- " + i for i in self.noodles]),
+            "Made Local :\n%s",
+            lambda: "\n".join(["- " + i.name for i in noodles]),
             multi_line=True,
         )
 
-        self.noodles = []
         return {"FINISHED"}
 
 
@@ -39,18 +74,20 @@ class BRD_Node_Localizer_All(Experimental_Poll, bpy.types.Operator):
 
     def execute(self, context):
 
-        self.asd = [
+        presets = [
             i
             for i in bpy.data.node_groups
             if i.name.startswith("G_") and i.type == "GEOMETRY"
         ]
+        names = {i.name_full for i in presets}
 
-        for i in self.asd:
-            i.make_local()
-            i.use_fake_user = True
+        # Presets are made local before the nested presets they use
+        self.asd = [i for i in dependency_order(presets) if i.name_full in names]
+        _localize(self.asd)
 
         log.debug(
-            "Made Local :\n" + "\n".join(["- " + i.name for i in self.asd]),
+            "Made Local :\n%s",
+            lambda: "\n".join(["- " + i.name for i in self.asd]),
             multi_line=True,
         )
 
@@ -73,6 +110,11 @@ class BRD_PT_Localizer(Experimental_Panel, bpy.types.Panel):
             text="Localize All Presets",
             icon="IMPORT",
         )
+        col.operator(
+            "bradley.node_sync",
+            text="Sync Localized Presets",
+            icon="FILE_REFRESH",
+        )
         col.scale_y = 3.0
 
 
@@ -0,0 +1,214 @@
+import bpy
+import json
+import os
+import shutil
+
+from ...Catalogs import preset_files
+from ...constants import BRD_CONST_DATA
+from ...Logger import log
+from .Dedup import HASH_VERSION, deduplicate, tree_hash
+from .utils import Experimental_Poll
+
+
+# Custom property holding the upstream fingerprint a group was localized
+# from; versioned, a fingerprint of an older tree_hash() never matches
+UPSTREAM_KEY = f"brd_upstream_v{HASH_VERSION}"
+
+
+def _index_path(sha):
+    return BRD_CONST_DATA.Folder / "sync_index" / f"{sha}.json"
+
+
+def _prune_index(keep):
+    """Remove the cached fingerprints of preset files no longer in use."""
+    for item in (BRD_CONST_DATA.Folder / "sync_index").glob("*.json"):
+        if item.stem not in keep:
+            item.unlink(missing_ok=True)
+
+
+def _alias(preset, sha):
+    """A second path to the bytes of preset, so Blender reads them as another library."""
+    alias = _index_path(sha).with_suffix(".blend")
+    alias.parent.mkdir(parents=True, exist_ok=True)
+    alias.unlink(missing_ok=True)
+    try:
+        os.link(preset, alias)
+    except OSError:
+        shutil.copyfile(preset, alias)
+    return alias
+
+
+def _localized_groups():
+    return [
+        i
+        for i in bpy.data.node_groups
+        if i.name.startswith("G_") and i.type == "GEOMETRY" and i.library is None
+    ]
+
+
+def preset_fingerprints(preset, sha):
+    """
+    {group name: fingerprint} for every G_* group in preset.blend, cached
+    in Data/sync_index/<sha>.json so it is computed once per preset version.
+    The groups are linked (never instantiated in a scene) just long enough
+    to be fingerprinted, then removed again.
+    """
+    index_file = _index_path(sha)
+    try:
+        with open(index_file, "r") as f:
+            cached = json.load(f)
+        if cached.get("version") == HASH_VERSION:
+            return cached["fingerprints"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    preset = str(preset)
+    source = preset
+    alias = None
+    if any(bpy.path.abspath(lib.filepath) == preset for lib in bpy.data.libraries):
+        # The open file links it already: libraries.load() would hand back
+        # the data read with the file, which may predate the download on
+        # disk. Link the same bytes under another name so they are read.
+        alias = _alias(preset, sha)
+        source = str(alias)
+
+    try:
+        with bpy.data.libraries.load(source, link=True) as (data_from, data_to):
+            data_to.node_groups = [n for n in data_from.node_groups if n.startswith("G_")]
+
+        memo = {}
+        index = {
+            g.name: tree_hash(g, memo)
+            for g in data_to.node_groups
+            if g is not None and g.type == "GEOMETRY"
+        }
+
+        # Leave the file exactly as it was
+        library = next(
+            (lib for lib in bpy.data.libraries if bpy.path.abspath(lib.filepath) == source), None
+        )
+        if library is not None:
+            bpy.data.libraries.remove(library)
+    finally:
+        if alias is not None:
+            alias.unlink(missing_ok=True)
+
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(index_file, "w") as f:
+        f.write(json.dumps({"version": HASH_VERSION, "fingerprints": index}))
+    return index
+
+
+def stamp_upstream(tree):
+    """Remember which upstream version a freshly localized group came from."""
+    tree[UPSTREAM_KEY] = tree_hash(tree)
+
+
+def sync_localized(overwrite_modified=False):
+    """
+    Replace localized G_* groups whose upstream fingerprint changed in the
+    current preset.blend (or the local catalogs of the per-catalog layout).
+    Groups the user edited after localizing are left alone unless
+    overwrite_modified is set.
+    Returns (replaced names, skipped modified names).
+    """
+    # The resolved download, not the import-time Blender version folder
+    files = [(path, sha) for path, sha in preset_files() if sha]
+    if not files:
+        raise FileNotFoundError("preset.blend has not been downloaded yet")
+
+    upstream = {}
+    source = {}
+    for path, sha in files:
+        for name, fingerprint in preset_fingerprints(path, sha).items():
+            upstream[name] = fingerprint
+            source[name] = path
+    _prune_index({sha for _, sha in files})
+
+    memo = {}
+    stale = []
+    modified = []
+    for tree in _localized_groups():
+        new = upstream.get(tree.name)
+        if new is None:
+            continue
+        current = tree_hash(tree, memo)
+        # Groups localized before fingerprints existed: compare content only
+        origin = tree.get(UPSTREAM_KEY, current)
+        if new in (origin, current):
+            continue
+        if current != origin and not overwrite_modified:
+            modified.append(tree.name)
+            continue
+        stale.append(tree)
+
+    if not stale:
+        return [], modified
+
+    names = [t.name for t in stale]
+    before = {g.session_uid for g in bpy.data.node_groups}
+    replaced = set()
+    for path in {source[name] for name in names}:
+        group = [t for t in stale if source[t.name] == path]
+        with bpy.data.libraries.load(str(path), link=False) as (data_from, data_to):
+            data_to.node_groups = [t.name for t in group]
+
+        for old, new in zip(group, data_to.node_groups):
+            if new is None:
+                continue
+            name = old.name
+            old.user_remap(new)
+            bpy.data.node_groups.remove(old)
+            new.name = name
+            new.use_fake_user = True
+            new[UPSTREAM_KEY] = upstream[name]
+            replaced.add(new.session_uid)
+
+    # Appending brings fresh copies of nested groups along; fold just those
+    # back, other copies in the file are the user's
+    appended = {g.session_uid for g in bpy.data.node_groups} - before - replaced
+    deduplicate(only=appended)
+    return names, modified
+
+
+class BRD_Node_Sync(Experimental_Poll, bpy.types.Operator):
+    bl_idname = "bradley.node_sync"
+    bl_label = "Sync Localized Presets"
+    bl_description = "Replace localized presets that changed in the updated preset file"
+    bl_options = {"REGISTER", "UNDO"}
+
+    overwrite_modified: bpy.props.BoolProperty(
+        name="Overwrite Edited",
+        description="Also replace localized presets that were edited in this file",
+        default=False,
+    )
+
+    def execute(self, context):
+
+        try:
+            replaced, modified = sync_localized(self.overwrite_modified)
+        except (OSError, RuntimeError) as e:
+            self.report({"WARNING"}, str(e))
+            return {"CANCELLED"}
+
+        log.debug(
+            "Synced :\n%s",
+            lambda: "\n".join(["- " + i for i in replaced]),
+            multi_line=True,
+        )
+        if modified:
+            log.debug(
+                "Skipped (edited locally) :\n%s",
+                lambda: "\n".join(["- " + i for i in modified]),
+                multi_line=True,
+            )
+        self.report(
+            {"INFO"},
+            f"Replaced {len(replaced)} presets"
+            + (f", skipped {len(modified)} edited ones" if modified else ""),
+        )
+
+        return {"FINISHED"}
+
+
+sync_panels = [BRD_Node_Sync]
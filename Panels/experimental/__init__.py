@@ -1,3 +1,8 @@
-from . import Localizer, utils
+from . import Dedup, Localizer, Sync, utils
 
-experimental_panels = [utils.BRD_EXPERIMENTAL_PT_Panel, Localizer.localizer_panels]
+experimental_panels = [
+    utils.BRD_EXPERIMENTAL_PT_Panel,
+    Localizer.localizer_panels,
+    Dedup.dedup_panels,
+    Sync.sync_panels,
+]
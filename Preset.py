@@ -1,18 +1,98 @@
 import bpy
 import re
 import shutil
-import requests
 import time
 from pathlib import Path, PurePath
-import bpy.utils.previews
 from platform import system
 from subprocess import Popen
-import json
 import os
 
-from .constants import BRD_CONST_DATA
+from .constants import BRD_CONST_DATA, settings
 from .Logger import log
-from .utils import connected_to_internet
+from .utils import connected_to_internet, connection_stats, get_session
+from .Cache import HTTPCache
+from .Integrity import HashIndex
+from .Scheduler import UpdateScheduler
+from .Jobs import jobs
+from .Lock import Leases, ProcessLock, release_at_exit
+from .Store import BlobStore
+from .Metrics import metrics
+from .Blend import BlendError, BlendIndex
+from .Catalogs import (
+    CATALOG_FOLDER,
+    catalog_cache,
+    catalog_of,
+    layout_sha,
+    preset_files,
+    split_listing,
+)
+from . import Manifest, Sources
+
+
+http_cache = HTTPCache(BRD_CONST_DATA.Folder / "http_cache.json")
+hash_index = HashIndex(BRD_CONST_DATA.Folder / "hash_index.json")
+store = BlobStore(BRD_CONST_DATA.Folder / "store")
+blend_index = BlendIndex(BRD_CONST_DATA.Folder / "blend_index")
+scheduler = UpdateScheduler(settings)
+
+# Shared by every Blender instance using this Data/ folder
+update_lock = ProcessLock(BRD_CONST_DATA.Folder / ".update.lock")
+leases = Leases(BRD_CONST_DATA.Folder)
+release_at_exit(update_lock, leases)
+
+API_URL = "https://api.github.com"
+# Value for Github.Manifest once the preset repository publishes one
+MANIFEST_URL = "https://raw.githubusercontent.com/{repo}/HEAD/" + Manifest.MANIFEST_NAME
+
+# Why the last update pass was refused, for the forced update's message
+last_refusal = None
+
+
+def is_frozen():
+    """
+    Frozen instances never touch the network and use the provisioned preset
+    as is (see Provision.py). Set with Updates.Frozen in settings.json:
+    true, or "background" for `blender -b` only; BRD_FROZEN=1 / 0 in the
+    environment overrides it, e.g. from a render farm job template.
+    """
+    env = os.environ.get("BRD_FROZEN")
+    if env is not None:
+        return env not in ("", "0")
+    mode = settings.get("Updates", "Frozen", default=False)
+    return mode is True or (mode == "background" and bpy.app.background)
+
+
+def _api(path):
+    """URL of a GitHub API path; the host can be overridden with Github.Api."""
+    return settings.get("Github", "Api", default=API_URL).rstrip("/") + path
+
+
+def _get_json(url, timeout):
+    """
+    GET a GitHub JSON endpoint through the conditional-request cache.
+    Returns (response, body). When GitHub answers 304 Not Modified the
+    cached body is returned and the response is treated like a 200.
+    body is None for any other non-200 status.
+    """
+    r = get_session().get(url, headers=http_cache.conditional_headers(url), timeout=timeout)
+    if "X-RateLimit-Remaining" in r.headers:
+        metrics.set("api_remaining", int(r.headers["X-RateLimit-Remaining"]))
+
+    if r.status_code == 304:
+        body = http_cache.hit(url)
+        if body is not None:
+            metrics.count("cache_hits")
+            return r, body
+        # Cache file was removed under us — ask again without validators
+        r = get_session().get(url, timeout=timeout)
+
+    if r.status_code != 200:
+        return r, None
+
+    body = r.json()
+    http_cache.store(url, r.headers, body)
+    metrics.count("cache_misses")
+    return r, body
 
 
 def _get_rate_limit_status():
@@ -21,92 +101,132 @@ def _get_rate_limit_status():
     This call does NOT consume your normal API quota.
     Returns (remaining, reset_at) or (None, None) if the check itself fails.
     """
+    import requests
+
     try:
-        r = requests.get("https://api.github.com/rate_limit", timeout=5)
+        r = get_session().get(_api("/rate_limit"), timeout=5)
         if r.status_code == 200:
             data = r.json()
             remaining = data["resources"]["core"]["remaining"]
             reset_at = data["resources"]["core"]["reset"]
+            metrics.set("api_remaining", remaining)
             return remaining, reset_at
     except requests.RequestException:
         pass
     return None, None
 
 
-def _resolve_best_version():
+@metrics.timed("fetch manifest")
+def _fetch_manifest():
+    """
+    Fetch the static manifest from the raw content host: one GET that is
+    not rate limited and is revalidated through the HTTP cache.
+    Returns the validated manifest, or None if it is missing, unusable or
+    not configured (Github.Manifest unset, the default until the preset
+    repository publishes one), in which case the caller falls back to the
+    GitHub contents API.
     """
-    Checks GitHub root for available version folders and returns the best
-    matching version string for the current Blender install.
+    import requests
 
-    Returns the best version string (e.g. "5.2") on success,
-    or None if we should abort (rate limited, timed out, no internet, etc).
+    template = settings.get("Github", "Manifest")
+    if not template:
+        return None
+    url = template.format(repo=settings.get("Github", "Repository"))
 
-    Also handles:
-    - Rate limit detection and cooldown caching (with live verification —
-      a cached cooldown is treated only as a fallback hint, not a hard skip,
-      since VPN/IP changes can reset GitHub's per-IP quota early)
-    - Cleaning up old version folders that are no longer the best match
-    - Creating the best version folder if it doesn't exist yet
+    try:
+        r, body = _get_json(url, timeout=(3, 10))
+    except (requests.RequestException, ValueError) as e:
+        log.debug("Manifest unavailable: %s", e)
+        return None
+
+    if body is None:
+        log.debug("Manifest unavailable: status %s", r.status_code)
+        return None
+
+    try:
+        return Manifest.load(body, url)
+    except Manifest.ManifestError as e:
+        log.warning("Ignoring invalid manifest: %s", e)
+        return None
+
+
+def _api_versions():
+    """
+    Version folders listed at the GitHub repository root, through the
+    contents API. Returns None if we should abort (rate limited, timed out).
     """
-    with open(BRD_CONST_DATA.Folder / "settings.json", "r") as f:
-        stuff = json.load(f)
+    import requests
+
+    repo = settings.get("Github", "Repository")
 
     remaining, live_reset_at = _get_rate_limit_status()
 
     if remaining is None:
-        # Couldn't verify live status — fall back to the cached cooldown as a guess
-        cached_reset = stuff.get("__DYN__", {}).get("rate_limit_reset", 0)
-        if time.time() < cached_reset:
-            print("BRD: Rate limit check unavailable, using cached cooldown.")
-            return None
-        # Otherwise just proceed and let the real request below tell us if we're limited
+        # Couldn't verify live status — let the real request below tell us
+        pass
     elif remaining <= 0:
         # Genuinely still limited right now, confirmed live
-        stuff["__DYN__"]["rate_limit_reset"] = live_reset_at
-        with open(BRD_CONST_DATA.Folder / "settings.json", "w") as f:
-            f.write(json.dumps(stuff))
-        print(f"BRD: Rate limit confirmed exhausted. Resets at {live_reset_at}.")
+        scheduler.trip(live_reset_at)
+        log.warning("Rate limit confirmed exhausted. Resets at %s.", live_reset_at)
         return None
     else:
-        # We have quota right now — clear any stale cooldown from a previous IP
-        if stuff.get("__DYN__", {}).get("rate_limit_reset", 0) != 0:
-            stuff["__DYN__"]["rate_limit_reset"] = 0
-            with open(BRD_CONST_DATA.Folder / "settings.json", "w") as f:
-                f.write(json.dumps(stuff))
-        print(f"BRD: Rate limit OK, {remaining} requests remaining.")
+        log.info("Rate limit OK, %s requests remaining.", remaining)
 
     try:
-        r = requests.get(
-            f"https://api.github.com/repos/{stuff['Github']['Repository']}/contents/",
+        r, repo_contents = _get_json(
+            _api(f"/repos/{repo}/contents/"),
             timeout=5
         )
     except requests.Timeout:
-        print("BRD: Version check timed out.")
+        log.warning("Version check timed out.")
         return None
     except requests.RequestException as e:
-        print(f"BRD: Version check failed: {e}")
+        log.warning("Version check failed: %s", e)
         return None
 
     if r.status_code in (403, 429):
         reset_at = int(r.headers.get("X-RateLimit-Reset", time.time() + 3600))
-        stuff["__DYN__"]["rate_limit_reset"] = reset_at
-        with open(BRD_CONST_DATA.Folder / "settings.json", "w") as f:
-            f.write(json.dumps(stuff))
-        print(f"BRD: GitHub rate limit reached. Cooldown until {reset_at}.")
+        scheduler.trip(reset_at)
+        log.warning("GitHub rate limit reached. Cooldown until %s.", reset_at)
         return None
 
-    if r.status_code != 200:
-        print(f"BRD: Unexpected GitHub status {r.status_code} during version check.")
+    if repo_contents is None:
+        log.warning("Unexpected GitHub status %s during version check.", r.status_code)
         return None
 
-    repo_contents = r.json()
-    vers = [
-        float(i["name"]) for i in repo_contents
+    return [
+        i["name"] for i in repo_contents
         if re.match(r"^-?\d+(?:\.\d+)$", i["name"])
     ]
 
+
+@metrics.timed("resolve best version")
+def _resolve_best_version(manifest=None, names=None):
+    """
+    Checks the manifest, or else the GitHub root, for available version
+    folders and returns the best matching version string for the current
+    Blender install. names skips the lookup when the caller already listed
+    the version folders.
+
+    Returns the best version string (e.g. "5.2") on success,
+    or None if we should abort (rate limited, timed out, no internet, etc).
+
+    Also handles:
+    - Rate limit detection (API fallback only): a confirmed exhausted quota
+      trips the scheduler's circuit breaker until GitHub's reset time
+    - Cleaning up old version folders that are no longer the best match,
+      except those another running instance holds a lease on
+    - Creating the best version folder if it doesn't exist yet
+    """
+    if names is None:
+        names = Manifest.versions(manifest) if manifest is not None else _api_versions()
+    if names is None:
+        return None
+
+    vers = [float(i) for i in names]
+
     if not vers:
-        print("BRD: No version folders found on GitHub.")
+        log.warning("No version folders found on GitHub.")
         return None
 
     local = float(str(bpy.app.version_string)[0:3])
@@ -122,21 +242,26 @@ def _resolve_best_version():
         else:
             best = str(min(vers, key=lambda x: abs(x - local)))
 
-    print(f"BRD: Blender {local} -> using preset version {best}")
+    log.info("Blender %s -> using preset version %s", local, best)
 
     # Create the best version folder if it doesn't exist
     best_folder = Path(PurePath(BRD_CONST_DATA.Folder, best))
     best_folder.mkdir(parents=True, exist_ok=True)
 
-    # Remove all other version folders
+    # Remove all other version folders; Data/ also holds non-version
+    # folders (e.g. sync_index) that must survive
     for item in BRD_CONST_DATA.Folder.iterdir():
-        if item.is_dir() and item.name != best:
-            print(f"BRD: Removing old version folder: {item.name}")
+        if item.is_dir() and item.name != best and re.match(r"^-?\d+(?:\.\d+)$", item.name):
+            if leases.in_use(item.name):
+                log.debug("Keeping %s, in use by another Blender instance", item.name)
+                continue
+            log.info("Removing old version folder: %s", item.name)
             shutil.rmtree(item)
 
     return best
 
 
+@metrics.timed("ensure asset library")
 def _ensure_asset_library():
     """
     Ensures the BRD_Data asset library entry exists in Blender preferences,
@@ -156,7 +281,7 @@ def _ensure_asset_library():
             # Already exists — make sure path is correct and leave it alone
             if lib.path != root_path:
                 lib.path = root_path
-                print(f"BRD: Asset library path corrected to: {root_path}")
+                log.info("Asset library path corrected to: %s", root_path)
             return
 
     # Doesn't exist yet — create it
@@ -175,113 +300,336 @@ def _ensure_asset_library():
         new_library.path = root_path
         new_library.import_method = 'PACK' if is_blender_5_0_or_later else 'LINK'
 
-    print(f"BRD: Asset library '{target_name}' created at: {root_path}")
+    log.info("Asset library '%s' created at: %s", target_name, root_path)
 
 
-def _download_preset(best_version, best_version_folder):
+@metrics.timed("download preset")
+def _download_preset(
+    best_version, best_version_folder, force=False, job=None, manifest=None, mirrors=()
+):
     """
     Pure file I/O + network. Safe to call from a background thread.
     Downloads preset.blend into Data/<version>/
     Downloads blender_assets.cats.txt into Data/ root (next to version folders)
     so that Blender finds it when scanning the Data/ root asset library.
+    Only files whose local git blob sha differs from GitHub's are fetched,
+    unless force is set; files already in the content store are linked
+    instead of downloaded. Progress is reported to job (Jobs.Job) if given.
+    The file list comes from manifest when given, else from the contents API.
+    Files are taken from mirrors ([(name, manifest)], see Sources) first
+    whenever one lists them with the same sha. Versions published in the
+    per-catalog layout are handed to _download_catalogs().
     Returns True on success, False on failure.
     """
-    with open(BRD_CONST_DATA.Folder / "settings.json", "r") as f:
-        stuff = json.load(f)
+    # Network stack is only loaded once an update actually runs
+    import requests
+    from .Delta import SIGNATURE_SUFFIX
+    from .Download import pick_compressed
 
-    repo_url = f"https://api.github.com/repos/{stuff['Github']['Repository']}/contents/{best_version}"
+    dyn = settings.dyn
 
-    try:
-        r = requests.get(repo_url, timeout=(3, 10))
-        if r.status_code != 200:
-            print(f"BRD: GitHub returned {r.status_code} for version {best_version}")
+    if manifest is not None:
+        repo_contents = Manifest.listing(manifest, best_version)
+    else:
+        repo_url = _api(f"/repos/{settings.get('Github', 'Repository')}/contents/{best_version}")
+        try:
+            r, repo_contents = _get_json(repo_url, timeout=(3, 10))
+            if repo_contents is None:
+                log.warning("GitHub returned %s for version %s", r.status_code, best_version)
+                return False
+        except requests.RequestException as e:
+            log.warning("GitHub request failed: %s", e)
             return False
-        repo_contents = r.json()
-    except requests.RequestException as e:
-        print(f"BRD: GitHub request failed: {e}")
-        return False
+
+    if split_listing(repo_contents):
+        return _download_catalogs(
+            best_version, best_version_folder, repo_contents, force=force, job=job, mirrors=mirrors
+        )
+
+    if catalog_cache.available():
+        catalog_cache.clear()
+        catalog_cache.save()
 
     preset_data = next((item for item in repo_contents if item["name"].endswith(".blend")), None)
-    text_files_data = [item for item in repo_contents if item["name"].endswith(".txt")]
 
     if not preset_data:
-        print("BRD: No preset .blend found in the repository.")
+        log.error("No preset .blend found in the repository.")
         return False
 
     sha = preset_data["sha"]
     version = preset_data["name"].lower().replace(" ", "")
     file_repo = preset_data["download_url"]
 
-    log.debug(f"sha new -> {sha}")
-    log.debug(f"sha current -> {BRD_CONST_DATA.__DYN__.sha}")
-    log.debug(f"Preset github version: {version}")
-    log.debug(f"Preset local version: {BRD_CONST_DATA.__DYN__.P_Version}")
+    log.debug("sha new -> %s", sha)
+    log.debug("sha current -> %s", dyn.sha)
+    log.debug("Preset github version: %s", version)
+    log.debug("Preset local version: %s", dyn.P_Version)
 
-    a = [i for i in best_version_folder.iterdir() if i.name.endswith(".blend")]
+    local_filename = best_version_folder / "preset.blend"
 
-    needs_update = (
-        BRD_CONST_DATA.__DYN__.P_Version == "__"
-        or BRD_CONST_DATA.__DYN__.P_Version != version
-        or sha != BRD_CONST_DATA.__DYN__.sha
-        or best_version != BRD_CONST_DATA.__DYN__.B_Version
-        or not a
+    # Block signature published next to the .blend, enables delta updates
+    signature_data = next(
+        (item for item in repo_contents if item["name"] == preset_data["name"] + SIGNATURE_SUFFIX),
+        None,
     )
 
-    if not needs_update:
+    artifacts = [
+        {
+            "url": file_repo,
+            "dest": local_filename,
+            "sha": sha,
+            "size": preset_data.get("size"),
+            "signature": signature_data["download_url"] if signature_data else None,
+            # e.g. preset.blend.xz, decompressed on the fly when present
+            "compressed": pick_compressed(preset_data["name"], repo_contents),
+            "mirrors": Sources.alternatives(mirrors, best_version, preset_data["name"], sha),
+        }
+    ]
+    artifacts += _text_artifacts(best_version, best_version_folder, repo_contents, mirrors)
+
+    results = _fetch_artifacts(artifacts, force=force, job=job, keep={sha})
+    if results.get(local_filename) is not None:
+        return False
+    if not results:
         log.debug("Preset -> Up to Date")
-        return True
+        if (
+            dyn.sha == sha
+            and dyn.B_Version == best_version
+        ):
+            return True
+
+    # The sha only proves the file is what was published; check that it is
+    # a usable .blend before switching to it. Also warms the index.
+    with metrics.span("index preset"):
+        try:
+            blend_index.get(local_filename, sha)
+        except (BlendError, OSError) as e:
+            log.error("Downloaded preset.blend is unusable: %s", e)
+            return False
 
-    log.debug("Preset -> Updating")
+    settings.set_dyn(
+        New=False,
+        P_Version=version,
+        B_Version=best_version,
+        File_Location=str(local_filename),
+        sha=sha,
+    )
 
-    # Remove old preset file if it exists
-    if (
-        stuff["__DYN__"]["File_Location"]
-        and stuff["__DYN__"]["File_Location"] != "."
-        and a
-    ):
-        Path(stuff["__DYN__"]["File_Location"]).unlink(missing_ok=True)
+    log.debug("Preset -> Updated")
+    return True
 
-    local_filename = best_version_folder / "preset.blend"
 
-    try:
-        with requests.get(file_repo, stream=True, timeout=(3, 30)) as r:
-            r.raise_for_status()
-            with open(str(local_filename), "wb") as f:
-                shutil.copyfileobj(r.raw, f)
-    except requests.RequestException as e:
-        print(f"BRD: Failed to download preset: {e}")
-        return False
+def _text_artifacts(best_version, best_version_folder, repo_contents, mirrors):
+    """Download artifacts of the .txt files of a version listing."""
+    artifacts = []
+    for text_file_data in repo_contents:
+        if not text_file_data["name"].endswith(".txt"):
+            continue
+        if text_file_data["name"] == "blender_assets.cats.txt":
+            # Always saved to Data/ root so Blender finds it at the library root
+            file_path = BRD_CONST_DATA.Folder / "blender_assets.cats.txt"
+        else:
+            # Other text files go into the version subfolder
+            file_path = best_version_folder / text_file_data["name"]
+        artifacts.append(
+            {
+                "url": text_file_data["download_url"],
+                "dest": file_path,
+                "sha": text_file_data.get("sha"),
+                "size": text_file_data.get("size"),
+                "mirrors": Sources.alternatives(
+                    mirrors, best_version, text_file_data["name"], text_file_data.get("sha")
+                ),
+            }
+        )
+    return artifacts
+
+
+def _fetch_artifacts(artifacts, force=False, job=None, keep=()):
+    """
+    Bring the dest of every artifact to its sha: files that already match
+    are kept, files in the content store are linked, the rest is downloaded
+    (everything when force is set). Blobs whose sha is in keep survive the
+    store eviction that follows a download.
+    Returns {dest: error} of the downloads (error None on success), empty
+    if nothing had to be downloaded.
+    """
+    from .Download import configure, download_many
+
+    store.max_bytes = settings.get("Store", "Max_MB", default=2048) << 20
+
+    # Trust the bytes on disk rather than the sha cached in settings.json
+    if not force:
+        artifacts = [a for a in artifacts if not hash_index.matches(a["dest"], a["sha"])]
+
+        # A version used before: a link into the store, no download
+        restored = [a for a in artifacts if a["sha"] and store.materialize(a["sha"], a["dest"])]
+        for a in restored:
+            hash_index.record(a["dest"], a["sha"])
+            metrics.count("store_restored")
+        if restored:
+            store.save()
+        artifacts = [a for a in artifacts if a not in restored]
+
+    if not artifacts:
+        hash_index.save()
+        return {}
+
+    log.debug(
+        "Preset -> Updating %s", lambda: ", ".join(Path(a["dest"]).name for a in artifacts)
+    )
+
+    network = settings.get("Network", default={})
+    configure(workers=network.get("Workers"), bandwidth=network.get("Bandwidth"))
+    if job is not None:
+        job.set_phase("Downloading", total_bytes=sum(a["size"] or 0 for a in artifacts))
+    run = metrics.current()
+
+    # Called from the download threads
+    def progress(n):
+        if job is not None:
+            job.add_bytes(n)
+        if run is not None:
+            run.count("bytes", n)
+
+    results = download_many(artifacts, progress=progress)
+    if job is not None:
+        job.check()
+
+    for a in artifacts:
+        error = results[a["dest"]]
+        if error is not None:
+            log.error("Failed to download %s: %s", Path(a["dest"]).name, error)
+        elif a["sha"]:
+            hash_index.record(a["dest"], a["sha"])
+            store.put(a["dest"], a["sha"])
+    hash_index.save()
+    store.evict(keep=keep)
+    blend_index.prune(lambda s: s in keep or store.has(s))
+    return results
+
+
+def _download_catalogs(
+    best_version, best_version_folder, repo_contents, force=False, job=None, mirrors=(), only=None
+):
+    """
+    _download_preset() for the per-catalog layout (see Catalogs.py): the
+    text files and every wanted catalog, or just the catalogs in only.
+    Catalog files no longer wanted are unlinked from the version folder,
+    their blobs stay in the store. Returns True if every catalog asked for
+    is in place.
+    """
+    available = split_listing(repo_contents)
+    catalog_cache.set_available(
+        best_version,
+        {
+            uuid: {key: item[key] for key in ("name", "sha", "size", "download_url", "catalog")}
+            for uuid, item in available.items()
+        },
+    )
+    wanted = catalog_cache.wanted() if only is None else set(only) & set(available)
+    folder = best_version_folder / CATALOG_FOLDER
+    folder.mkdir(parents=True, exist_ok=True)
+
+    artifacts = []
+    if only is None:
+        artifacts += _text_artifacts(best_version, best_version_folder, repo_contents, mirrors)
+    for uuid in sorted(wanted):
+        item = available[uuid]
+        artifacts.append(
+            {
+                "url": item["download_url"],
+                "dest": folder / f"{uuid}.blend",
+                "sha": item["sha"],
+                "size": item.get("size"),
+                "mirrors": Sources.alternatives(mirrors, best_version, item["name"], item["sha"]),
+            }
+        )
+
+    # Every catalog of the version, local or switched off, keeps its blob;
+    # an on-demand fetch of one catalog must not evict the others
+    keep = {item["sha"] for item in available.values()} | set(catalog_cache.local().values())
+    results = _fetch_artifacts(artifacts, force=force, job=job, keep=keep)
+    ok = all(error is None for error in results.values())
+
+    with metrics.span("index catalogs"):
+        for uuid in sorted(wanted):
+            dest = folder / f"{uuid}.blend"
+            if results.get(dest) is not None:
+                continue
+            try:
+                blend_index.get(dest, available[uuid]["sha"])
+            except (BlendError, OSError) as e:
+                log.error("Catalog %s is unusable: %s", uuid, e)
+                ok = False
+                continue
+            catalog_cache.record(uuid, available[uuid]["sha"])
+
+    if only is None:
+        # A preset.blend left over from the monolithic layout stays: files
+        # saved with links to it keep resolving (see relocate_presets())
+        _unlink_catalogs(folder, wanted)
+    catalog_cache.save()
+
+    local = catalog_cache.local()
+    if local:
+        settings.set_dyn(
+            New=False,
+            P_Version=CATALOG_FOLDER,
+            B_Version=best_version,
+            File_Location=str(folder),
+            sha=layout_sha(available),
+        )
+    log.debug("Catalogs -> %s of %s local", len(local), len(available))
+    return ok
+
 
-    for text_file_data in text_files_data:
+def _unlink_catalogs(folder, wanted):
+    """Remove catalog files not in wanted from folder; the store keeps them."""
+    for path in folder.glob("*.blend"):
+        uuid = catalog_of(path)
+        if uuid is None or uuid in wanted:
+            continue
         try:
-            if text_file_data["name"] == "blender_assets.cats.txt":
-                # Always saved to Data/ root so Blender finds it at the library root
-                file_path = BRD_CONST_DATA.Folder / "blender_assets.cats.txt"
-            else:
-                # Other text files go into the version subfolder
-                file_path = best_version_folder / text_file_data["name"]
-
-            with requests.get(text_file_data["download_url"], stream=True, timeout=(3, 30)) as r:
-                r.raise_for_status()
-                with open(str(file_path), "w", encoding="utf-8") as f:
-                    for line in r.text.splitlines():
-                        f.write(line + "\n")
-        except requests.RequestException as e:
-            print(f"BRD: Failed to download {text_file_data['name']}: {e}")
-
-    stuff["__DYN__"] = {
-        "New": False,
-        "P_Version": version,
-        "B_Version": best_version,
-        "File_Location": str(local_filename),
-        "Debug": BRD_CONST_DATA.__DYN__.Debug,
-        "sha": sha,
-    }
-    with open(BRD_CONST_DATA.Folder / "settings.json", "w") as f:
-        f.write(json.dumps(stuff))
+            path.unlink()
+        except OSError as e:
+            # e.g. open in another Blender on Windows, next pass tries again
+            log.debug("Keeping catalog %s: %s", uuid, e)
+            continue
+        log.debug("Catalog %s unlinked", uuid)
+    for uuid in set(catalog_cache.local()) - wanted:
+        catalog_cache.forget(uuid)
 
-    log.debug("Preset -> Updated")
-    return True
+
+def _fetch_catalogs(uuids, job=None):
+    """
+    Download catalogs of the per-catalog layout on demand: enabled in the
+    preferences or needed by an opened file. Uses what the last manifest
+    listed (Data/catalogs.json), so only the files themselves are fetched.
+    Returns True if they are all in place.
+    """
+    if is_frozen():
+        log.debug("Frozen, not fetching catalogs")
+        return False
+    version = catalog_cache.version
+    if version is None or settings.dyn.B_Version != version:
+        return False
+
+    if not update_lock.acquire():
+        _await_other_update(job)
+        if not update_lock.acquire():
+            log.debug("Another instance took over the update")
+            return False
+    try:
+        if job is not None:
+            job.set_phase("Checking sources")
+        mirrors = Sources.fetch_manifests()
+        listing = list(catalog_cache.available().values())
+        folder = Path(PurePath(BRD_CONST_DATA.Folder, version))
+        with settings.batch():
+            return _download_catalogs(version, folder, listing, job=job, mirrors=mirrors, only=uuids)
+    finally:
+        update_lock.release()
 
 
 class BRD_Asset(bpy.types.Operator):
@@ -311,35 +659,267 @@ class BRD_Remove(bpy.types.Operator):
 
         if matching_index is not None:
             bpy.ops.preferences.asset_library_remove(index=matching_index)
-            print(f"BRD: Asset library '{target_name}' removed.")
+            log.info("Asset library '%s' removed.", target_name)
         else:
-            print(f"BRD: No asset library with name '{target_name}' found.")
+            log.info("No asset library with name '%s' found.", target_name)
 
         return {'FINISHED'}
 
 
+@metrics.recorded("update")
+def _run_update(force=False, job=None):
+    """
+    One update pass: scheduler gate, manifest (or connectivity probe and
+    contents API), version resolution and download.
+    Pure file I/O + network, runs on a job engine worker.
+    Only one Blender instance per Data/ folder runs a pass at a time; the
+    others wait for it and reuse its result.
+    Returns True if the preset is current afterwards.
+    Raises Jobs.JobCancelled if job is cancelled.
+    """
+    # Keep the folder this instance uses from being removed by another one
+    dyn = settings.dyn
+    if dyn.B_Version != "__":
+        leases.hold(dyn.B_Version)
+
+    global last_refusal
+    last_refusal = None
+
+    if is_frozen():
+        log.debug("Frozen, using the provisioned preset")
+        return hold_current_preset()
+
+    allowed, reason = scheduler.should_check(force=force, missing=not preset_files())
+    if not allowed and force:
+        allowed, reason = _probe_breaker()
+    if not allowed:
+        # Offline-first: nothing touches the network
+        log.debug("Update skipped: %s", reason)
+        last_refusal = reason
+        return False
+
+    if not update_lock.acquire():
+        _await_other_update(job)
+        # A pass that just succeeded elsewhere makes ours unnecessary
+        allowed, reason = scheduler.should_check()
+        if not allowed:
+            log.debug("Reusing the update of another instance (%s)", reason)
+            return hold_current_preset()
+        if not update_lock.acquire():
+            log.debug("Another instance took over the update")
+            return False
+
+    try:
+        return _update_pass(force, job)
+    finally:
+        update_lock.release()
+
+
+def _probe_breaker():
+    """
+    A forced update while the breaker is open. A cached cooldown is only a
+    hint: a VPN or IP change resets GitHub's per-IP quota, and a breaker
+    opened by failures may just mean the machine was offline. One
+    /rate_limit call, which costs no quota, decides. Returns (allowed, reason).
+    """
+    remaining, reset_at = _get_rate_limit_status()
+    if remaining is None:
+        if settings.get("Sources", default=[]):
+            return True, "forced, GitHub unreachable, trying the mirrors"
+        return False, "GitHub is unreachable"
+    if remaining <= 0:
+        scheduler.trip(reset_at)
+        return False, scheduler.open_reason()
+    log.debug("Rate limit probe: %s requests remaining, closing the breaker", remaining)
+    scheduler.reset()
+    return True, "forced, quota available"
+
+
+def _await_other_update(job):
+    """Block until the instance holding the update lock is done (or died)."""
+    holder = update_lock.holder() or {}
+    log.debug("Update running in %s:%s, waiting for it", holder.get("host"), holder.get("pid"))
+    if job is not None:
+        job.set_phase("Waiting for another Blender")
+    update_lock.wait(check=job.check if job is not None else None)
+    # Pick up what the other instance wrote
+    settings.reload()
+
+
+def hold_current_preset():
+    """
+    Lease the version folder of the local preset, so no other instance
+    removes it while it is in use. False if there is no local preset.
+    """
+    if not preset_files():
+        return False
+    leases.hold(settings.dyn.B_Version)
+    return True
+
+
+def _update_pass(force, job):
+    """_run_update() with the update lock held."""
+    start_stats = connection_stats()
+
+    if job is not None:
+        job.set_phase("Checking connection")
+    with metrics.span("sources"):
+        mirrors = Sources.fetch_manifests()
+    # Probe first so an offline pass fails fast instead of retrying the
+    # manifest GET
+    with metrics.span("connectivity"):
+        online = connected_to_internet(_api("/rate_limit"))
+    if not online and not mirrors:
+        log.debug("No internet connection available")
+        scheduler.record_failure()
+        return False
+
+    # GitHub decides the version and files, mirrors only serve the same
+    # shas: a mirror seeded from an old download must not hold back updates
+    manifest = names = None
+    if online:
+        manifest = _fetch_manifest()
+        if manifest is None:
+            names = _api_versions()
+    if manifest is None and names is None:
+        if not mirrors:
+            scheduler.record_failure()
+            http_cache.save()
+            return False
+        # GitHub failed, the preferred mirror's manifest decides
+        log.debug("GitHub unavailable, using the manifest of %s", mirrors[0][0])
+        manifest = mirrors[0][1]
+
+    # Every settings change of this run is written once at the end
+    with settings.batch():
+        if job is not None:
+            job.set_phase("Resolving version")
+        best_version = _resolve_best_version(manifest, names=names)
+
+        ok = best_version is not None
+        if ok:
+            best_version_folder = Path(PurePath(BRD_CONST_DATA.Folder, best_version))
+            ok = _download_preset(
+                best_version,
+                best_version_folder,
+                force=force,
+                job=job,
+                manifest=manifest,
+                mirrors=mirrors,
+            )
+
+        if ok:
+            leases.hold(best_version)
+            scheduler.record_success()
+        else:
+            scheduler.record_failure()
+
+    n_requests, n_connections = (
+        now - before for now, before in zip(connection_stats(), start_stats)
+    )
+    metrics.set("requests", n_requests)
+    metrics.set("connections", n_connections)
+    log.debug(
+        "%s requests over %s connections (%s handshakes saved)",
+        n_requests,
+        n_connections,
+        max(n_requests - n_connections, 0),
+    )
+    http_cache.save()
+    log.debug("HTTP cache -> %s", http_cache.stats())
+    return ok
+
+
+def _force_update_done(job, result, error):
+    """Main thread, after a forced update finished."""
+    if not result and error is None:
+        reason = last_refusal or "see the console for details"
+        log.warning("Forced update did not complete: %s.", reason)
+
+    # Also ensure library entry is correct while we're on the main thread
+    _ensure_asset_library()
+
+
+def relocate_presets():
+    """
+    Point every library linked from the presets at the local download:
+    preset.blend, or the file of its catalog in the per-catalog layout.
+    Uses the version folder resolved by the last update (the file may come
+    from another machine or an older Blender), and only reloads libraries
+    whose path differs, so opening a file that is already correct costs
+    no reload at all. Catalogs the file uses count as touched and missing
+    ones are fetched in the background. Main thread only.
+    """
+    location = settings.dyn.File_Location
+    if not location:
+        return
+    location = Path(location).resolve()
+    split = location.name == CATALOG_FOLDER
+
+    used = set()
+    for lib in bpy.data.libraries:
+        uuid = catalog_of(lib.filepath)
+        if uuid is not None:
+            used.add(uuid)
+            target = location / f"{uuid}.blend" if split else None
+        elif "preset.blend" in lib.name:
+            # Kept next to catalogs/ in the per-catalog layout, see _download_catalogs()
+            target = location.parent / "preset.blend" if split else location
+        else:
+            continue
+        if target is None or not target.is_file():
+            continue
+        try:
+            current = Path(bpy.path.abspath(lib.filepath, library=lib.parent)).resolve()
+        except (OSError, RuntimeError):
+            current = None
+        if current == target:
+            continue
+        log.debug("Relocating %s: %s -> %s", lib.name, lib.filepath, target)
+        lib.filepath = str(target)
+        lib.reload()
+
+    if used:
+        catalog_cache.touch(used)
+        missing = (used & set(catalog_cache.available())) - set(catalog_cache.local())
+        if split and missing:
+            request_catalogs(missing)
+
+
+def request_catalogs(uuids):
+    """Main thread: fetch catalogs in the background. None if a fetch is already running."""
+    uuids = set(uuids)
+    return jobs.submit(
+        "catalogs",
+        "Fetching preset catalogs",
+        lambda job: _fetch_catalogs(uuids, job),
+        on_done=lambda job, result, error: _catalogs_done(uuids),
+    )
+
+
+def _catalogs_done(uuids):
+    """Main thread, after catalogs were fetched: load them into open files."""
+    folder = Path(settings.dyn.File_Location)
+    for lib in bpy.data.libraries:
+        uuid = catalog_of(lib.filepath)
+        if uuid in uuids and (folder / f"{uuid}.blend").is_file():
+            lib.filepath = str(folder / f"{uuid}.blend")
+            lib.reload()
+
+
 class BRD_Update(bpy.types.Operator):
     bl_idname = "bradley.update"
     bl_label = "bradley update"
 
     def execute(self, context):
         """
-        Called from a background thread — all work must be pure file I/O
-        and network only. bpy calls are not safe here.
+        Queues an update pass on the job engine and returns immediately.
+        The pass itself is pure file I/O and network on a worker thread;
         _ensure_asset_library() was already called on the main thread by
-        BRD_Asset before this thread started, so no bpy work needed here.
+        BRD_Asset, so no bpy work is needed afterwards.
         """
-        if not connected_to_internet():
-            log.debug("No internet connection available")
-            return {"FINISHED"}
-
-        best_version = _resolve_best_version()
-        if best_version is None:
-            return {"FINISHED"}
-
-        best_version_folder = Path(PurePath(BRD_CONST_DATA.Folder, best_version))
-        _download_preset(best_version, best_version_folder)
-
+        if jobs.submit("update", "Preset update", lambda job: _run_update(job=job)) is None:
+            log.debug("Update already running")
         return {"FINISHED"}
 
 
@@ -349,47 +929,126 @@ class BRD_Force_Update(bpy.types.Operator):
 
     def execute(self, context):
         """
-        Called from a UI button — runs on the main thread.
-        Forces re-download regardless of sha/version match.
+        Called from a UI button. Queues a forced update that re-downloads
+        regardless of sha/version match and freshness. An open circuit
+        breaker is checked live against /rate_limit first. The UI never blocks.
         """
-        if not connected_to_internet():
-            log.debug("No internet connection available")
-            return {"FINISHED"}
+        if is_frozen():
+            self.report({"WARNING"}, "Presets are frozen to the provisioned version.")
+            return {"CANCELLED"}
+        job = jobs.submit(
+            "update",
+            "Forced preset update",
+            lambda job: _run_update(force=True, job=job),
+            on_done=_force_update_done,
+        )
+        if job is None:
+            self.report({"INFO"}, "A preset update is already running.")
+            return {"CANCELLED"}
+        return {"FINISHED"}
 
-        best_version = _resolve_best_version()
-        if best_version is None:
-            return {"FINISHED"}
 
-        best_version_folder = Path(PurePath(BRD_CONST_DATA.Folder, best_version))
+class BRD_Cancel_Job(bpy.types.Operator):
+    bl_idname = "bradley.cancel_job"
+    bl_label = "Cancel Background Job"
+    bl_description = "Stop this background job, downloads resume next time"
 
-        # Force re-download by temporarily clearing the sha
-        original_sha = BRD_CONST_DATA.__DYN__.sha
-        BRD_CONST_DATA.__DYN__.sha = ""
-        _download_preset(best_version, best_version_folder)
-        BRD_CONST_DATA.__DYN__.sha = original_sha
+    # Key of the job (Jobs.JobEngine), e.g. "update", "catalogs" or "seed"
+    key: bpy.props.StringProperty(default="update")
 
-        # Also ensure library entry is correct while we're on the main thread
-        _ensure_asset_library()
+    def execute(self, context):
+        job = jobs.get(self.key)
+        if job is not None:
+            job.cancel()
+        return {"FINISHED"}
+
+
+class BRD_Toggle_Catalog(bpy.types.Operator):
+    bl_idname = "bradley.toggle_catalog"
+    bl_label = "Toggle Preset Catalog"
+    bl_description = "Keep this catalog downloaded, or free its disk space"
+
+    catalog: bpy.props.StringProperty()
 
+    def execute(self, context):
+        available = catalog_cache.available()
+        if self.catalog not in available:
+            self.report({"WARNING"}, "Unknown catalog.")
+            return {"CANCELLED"}
+
+        # Flip what the checkbox shows, which includes catalogs in use
+        turn_on = self.catalog not in catalog_cache.wanted()
+        enabled = settings.get("Catalogs", "Enabled", default=None)
+        enabled = set(available) if enabled is None else set(enabled)
+        if turn_on:
+            enabled.add(self.catalog)
+        else:
+            enabled.discard(self.catalog)
+        settings.update("Catalogs", Enabled=sorted(enabled))
+
+        if turn_on:
+            if self.catalog not in catalog_cache.local() and request_catalogs({self.catalog}) is None:
+                self.report({"INFO"}, "Catalogs are being fetched, try again in a moment.")
+        else:
+            # Overrides the files that used it, opening one fetches it again
+            catalog_cache.untouch(self.catalog)
+            folder = Path(settings.dyn.File_Location)
+            if folder.name == CATALOG_FOLDER:
+                _unlink_catalogs(folder, catalog_cache.wanted())
+            catalog_cache.save()
         return {"FINISHED"}
 
 
+class BRD_Seed_Mirror(bpy.types.Operator):
+    bl_idname = "bradley.seed_mirror"
+    bl_label = "Seed Preset Mirror"
+    bl_description = "Copy the downloaded presets into a shared folder other machines can use as a source"
+
+    directory: bpy.props.StringProperty(subtype="DIR_PATH")
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        directory = self.directory
+        job = jobs.submit(
+            "seed",
+            "Seeding preset mirror",
+            lambda job: _seed_mirror(directory, job),
+            on_done=lambda job, copied, error: _seed_mirror_done(directory, copied, error),
+        )
+        if job is None:
+            self.report({"INFO"}, "A mirror is already being seeded.")
+            return {"CANCELLED"}
+        return {"FINISHED"}
+
+
+def _seed_mirror(directory, job):
+    """Worker: copies and hashes hundreds of MB, never on the main thread."""
+    try:
+        return Sources.seed_mirror(directory, hash_index, job=job)
+    finally:
+        hash_index.save()
+
+
+def _seed_mirror_done(directory, copied, error):
+    # JobEngine already printed the error
+    if error is None:
+        log.debug("Mirror %s seeded: %s", directory, copied)
+        log.info("Mirror %s updated, %s files copied.", directory, len(copied))
+
+
 class BRD_Folder(bpy.types.Operator):
     bl_idname = "bradley.folder"
     bl_label = "bradley folder"
 
     def execute(self, context):
-        # Read File_Location from settings.json — this is always written by
+        # Read File_Location from the settings store — this is always written by
         # _download_preset() with the correct resolved version path, unlike
         # BRD_CONST_DATA.File_Location() which uses the import-time Blender version
         # and may point at a folder that doesn't exist (e.g. 5.3 when best is 5.2).
-        try:
-            with open(BRD_CONST_DATA.Folder / "settings.json", "r") as f:
-                stuff = json.load(f)
-            file_location = stuff["__DYN__"].get("File_Location", "")
-        except Exception as e:
-            print(f"BRD: Could not read settings.json: {e}")
-            file_location = ""
+        file_location = settings.dyn.File_Location
 
         if not file_location or file_location == ".":
             self.report({"WARNING"}, "Preset file not downloaded yet.")
@@ -401,7 +1060,7 @@ class BRD_Folder(bpy.types.Operator):
             self.report({"WARNING"}, f"Preset file not found at: {self.place}")
             return {"CANCELLED"}
 
-        log.debug(f"Opening {self.place}")
+        log.debug("Opening %s", self.place)
 
         if system() == "Windows":
             Popen(["explorer", "/select,", self.place])
@@ -413,4 +1072,13 @@ class BRD_Folder(bpy.types.Operator):
         return {"FINISHED"}
 
 
-preset_help = [BRD_Folder, BRD_Asset, BRD_Remove, BRD_Update, BRD_Force_Update]
\ No newline at end of file
+preset_help = [
+    BRD_Folder,
+    BRD_Asset,
+    BRD_Remove,
+    BRD_Update,
+    BRD_Force_Update,
+    BRD_Cancel_Job,
+    BRD_Seed_Mirror,
+    BRD_Toggle_Catalog,
+]
\ No newline at end of file
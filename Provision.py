@@ -0,0 +1,159 @@
+"""
+Headless provisioning, e.g. for render farm nodes.
+
+Fills Data/ from a mirror (see Sources) or GitHub and verifies the result,
+without the UI or the background updater:
+
+    blender -b --python Provision.py -- --source /mnt/presets --freeze background
+    blender -b --python-expr "import bradley_presets.Provision as p; p.main()" -- --verify-only
+
+--freeze sets Updates.Frozen in settings.json, so the instances started
+afterwards never touch the network and use the provisioned preset (see
+Preset.is_frozen). The exit code is 0 when the preset is in place and
+verified, 1 when verification failed and 2 when provisioning failed.
+"""
+
+if __name__ == "__main__" and not __package__:
+    # Run as a script: load the add-on as a package so relative imports work
+    import importlib
+    import importlib.util
+    import sys
+    from pathlib import Path
+
+    _root = Path(__file__).resolve().parent
+    _spec = importlib.util.spec_from_file_location(
+        "brd_provision", _root / "__init__.py", submodule_search_locations=[str(_root)]
+    )
+    _package = importlib.util.module_from_spec(_spec)
+    sys.modules[_spec.name] = _package
+    _spec.loader.exec_module(_package)
+    sys.exit(importlib.import_module("brd_provision.Provision").main())
+
+import argparse
+import sys
+from pathlib import Path, PurePath
+
+from . import Preset, Sources
+from .Blend import BlendError, assets
+from .Catalogs import preset_files
+from .constants import BRD_CONST_DATA, settings
+from .Logger import log
+from .utils import git_blob_sha
+
+
+FREEZE_MODES = {"off": False, "background": "background", "always": True}
+
+def provision(source=None):
+    """
+    Download the preset for this Blender version into Data/, from source
+    (a mirror path or url) if given, else from GitHub.
+    Waits for any other instance updating the same Data/ folder.
+    Returns the list of problems found, empty on success.
+    """
+    if not Preset.update_lock.acquire():
+        print("BRD: Waiting for another Blender instance to finish its update")
+        Preset.update_lock.wait()
+        settings.reload()
+        if not Preset.update_lock.acquire():
+            return ["another instance took over the update"]
+
+    try:
+        if source is not None:
+            root = Sources.as_url(source)
+            try:
+                manifest = Sources.read_manifest(root)
+            except Exception as e:
+                return [f"source {source} unusable: {e}"]
+            mirrors = [(source, manifest)]
+        else:
+            manifest = Preset._fetch_manifest()
+            mirrors = []
+
+        with settings.batch():
+            best_version = Preset._resolve_best_version(manifest)
+            if best_version is None:
+                return ["no preset version available"]
+
+            folder = Path(PurePath(BRD_CONST_DATA.Folder, best_version))
+            if not Preset._download_preset(
+                best_version, folder, manifest=manifest, mirrors=mirrors
+            ):
+                return ["download failed"]
+
+            Preset.leases.hold(best_version)
+            Preset.scheduler.record_success()
+        Preset.hash_index.save()
+    finally:
+        Preset.update_lock.release()
+
+    return []
+
+
+def verify():
+    """
+    Check the preset in Data/ (preset.blend, or the local catalogs of the
+    per-catalog layout) against the shas recorded at download time and
+    its block structure. Hashes the whole files rather than trusting the
+    hash index, since this is what a frozen instance will use as is.
+    Returns the problems found.
+    """
+    files = preset_files()
+    if not files:
+        return ["preset.blend has not been downloaded"]
+
+    problems = []
+    found = 0
+    for path, expected in files:
+        sha = git_blob_sha(path)
+        if sha != expected:
+            problems.append(f"{path} has sha {sha}, expected {expected}")
+            continue
+        try:
+            found += len(assets(Preset.blend_index.get(path, sha), "NT"))
+        except BlendError as e:
+            problems.append(f"{path} is not a usable .blend: {e}")
+    if not found and not problems:
+        problems.append("the presets hold no node group assets")
+
+    cats = BRD_CONST_DATA.Folder / "blender_assets.cats.txt"
+    if not cats.is_file():
+        problems.append(f"{cats} is missing")
+    return problems
+
+
+def _arguments(argv):
+    # Blender's own arguments end at "--"
+    if argv is None:
+        argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+
+    parser = argparse.ArgumentParser(
+        prog="Provision.py", description="Provision the Bradley presets headlessly."
+    )
+    parser.add_argument("--source", help="mirror folder or url to provision from, default GitHub")
+    parser.add_argument("--freeze", choices=FREEZE_MODES, help="set Updates.Frozen afterwards")
+    parser.add_argument(
+        "--verify-only", action="store_true", help="only check what is already in Data/"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = _arguments(argv)
+
+    problems = [] if args.verify_only else provision(args.source)
+    if problems:
+        code = 2
+    else:
+        problems = verify()
+        code = 1 if problems else 0
+
+    # Only a verified preset may be frozen
+    if not problems and args.freeze is not None:
+        settings.update("Updates", Frozen=FREEZE_MODES[args.freeze])
+
+    for problem in problems:
+        print(f"BRD: {problem}")
+    if not problems:
+        print(f"BRD: Preset {settings.dyn.B_Version} verified: {settings.dyn.File_Location}")
+    log.flush()
+    return code
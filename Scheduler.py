@@ -0,0 +1,118 @@
+import random
+import time
+
+from .Logger import log
+
+
+class UpdateScheduler:
+    """
+    Decides whether an update pass may touch the network at all.
+
+    - Freshness TTL: after a successful check nothing is fetched again until
+      Updates.TTL seconds have passed.
+    - Exponential backoff with jitter after failures (offline, captive
+      proxy, GitHub errors).
+    - A circuit breaker that opens after Updates.Breaker_Threshold
+      consecutive failures, or immediately when GitHub reports the rate
+      limit as exhausted, and stays open until the cooldown / reset time.
+      Once it expires a single probe is let through (half-open); failing
+      that probe opens it again. Breaker_Reason remembers which of the two
+      opened it, so the user can be told why updates are paused.
+
+    All state lives in the __DYN__ section of settings.json so it survives
+    restarts.
+    """
+
+    DEFAULTS = {
+        "TTL": 6 * 3600,
+        "Backoff_Base": 60,
+        "Backoff_Max": 6 * 3600,
+        "Breaker_Threshold": 3,
+        "Breaker_Cooldown": 3600,
+    }
+
+    def __init__(self, settings):
+        self.settings = settings
+
+    def _config(self, key):
+        return self.settings.get("Updates", key, self.DEFAULTS[key])
+
+    def is_open(self, now=None):
+        now = time.time() if now is None else now
+        return now < self.settings.dyn.Breaker_Open_Until
+
+    def rate_limited(self, now=None):
+        """True while the breaker is open because GitHub reported the quota exhausted."""
+        return self.is_open(now) and self.settings.dyn.Breaker_Reason == "rate limit"
+
+    def open_reason(self, now=None):
+        """Why updates are paused, for the user; None if the breaker is closed."""
+        if not self.is_open(now):
+            return None
+        until = time.ctime(self.settings.dyn.Breaker_Open_Until)
+        if self.rate_limited(now):
+            return f"GitHub rate limit reached, resets at {until}"
+        return f"{self.settings.dyn.Failures} update attempts failed (offline?), paused until {until}"
+
+    def should_check(self, force=False, now=None, missing=False):
+        """
+        Return (allowed, reason). force skips the TTL and the backoff but
+        never an open breaker, which protects the shared GitHub quota; the
+        caller may probe the quota and reset() it. missing (no local preset)
+        skips the TTL only.
+        """
+        now = time.time() if now is None else now
+        dyn = self.settings.dyn
+
+        if self.is_open(now):
+            return False, f"circuit open until {time.ctime(dyn.Breaker_Open_Until)}"
+        if force:
+            return True, "forced"
+        if not missing and now - dyn.Last_Check < self._config("TTL"):
+            return False, f"checked {int(now - dyn.Last_Check)}s ago"
+        if now < dyn.Next_Attempt:
+            return False, f"backing off until {time.ctime(dyn.Next_Attempt)}"
+        return True, "due"
+
+    def record_success(self, now=None):
+        now = time.time() if now is None else now
+        self.settings.set_dyn(
+            Last_Check=now,
+            Failures=0,
+            Next_Attempt=0,
+            Breaker_Open_Until=0,
+            Breaker_Reason="",
+        )
+
+    def record_failure(self, now=None):
+        now = time.time() if now is None else now
+        dyn = self.settings.dyn
+        if self.is_open(now):
+            # Already tripped by trip(), keep its reset time
+            return
+
+        failures = dyn.Failures + 1
+        half_open = dyn.Breaker_Open_Until != 0
+
+        delay = min(
+            self._config("Backoff_Max"),
+            self._config("Backoff_Base") * 2 ** (failures - 1),
+        )
+        # "Equal jitter": keep at least half the delay, spread the rest so a
+        # whole studio floor does not retry in lockstep
+        delay = delay / 2 + random.uniform(0, delay / 2)
+
+        changes = {"Failures": failures, "Next_Attempt": now + delay}
+        if half_open or failures >= self._config("Breaker_Threshold"):
+            changes["Breaker_Open_Until"] = now + self._config("Breaker_Cooldown")
+            changes["Breaker_Reason"] = "failures"
+            log.debug("Update circuit opened after %s failures", failures)
+        self.settings.set_dyn(**changes)
+
+    def trip(self, until):
+        """Open the breaker until GitHub's rate limit reset time."""
+        self.settings.set_dyn(Breaker_Open_Until=float(until), Breaker_Reason="rate limit")
+
+    def reset(self):
+        """Close the breaker, e.g. after a live check found quota again."""
+        self.settings.set_dyn(Breaker_Open_Until=0, Breaker_Reason="")
@@ -0,0 +1,109 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict
+from pathlib import Path
+
+from .Dtcls import __DYN__
+
+
+class Settings:
+    """
+    Single owner of Data/settings.json.
+    The file is parsed once; the "__DYN__" section is exposed as a typed
+    __DYN__ dataclass shared with BRD_CONST_DATA. Changes only mark the
+    store dirty. They are written out by flush(), or once at the end of the
+    outermost batch() of the calling thread, as one atomic temp-file-plus-
+    rename. A re-entrant lock serialises the background update thread and
+    UI callbacks; it is never held across a batch, so a long update does
+    not block the UI.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.RLock()
+        self._data = None
+        self._dyn = None
+        self._dirty = False
+        self._local = threading.local()
+
+    def _load(self):
+        if self._data is None:
+            with open(self.path, "r") as f:
+                self._data = json.load(f)
+            self._dyn = __DYN__.from_dict(self._data.get("__DYN__", {}))
+        return self._data
+
+    @property
+    def data(self):
+        """The parsed settings. Treat as read-only, use update() to change it."""
+        with self._lock:
+            return self._load()
+
+    @property
+    def dyn(self):
+        with self._lock:
+            self._load()
+            return self._dyn
+
+    def reload(self):
+        """
+        Re-read the file on next access, e.g. after another Blender instance
+        finished an update. Pending changes of this instance are kept.
+        """
+        with self._lock:
+            if not self._dirty:
+                self._data = None
+                self._dyn = None
+
+    def get(self, section, key=None, default=None):
+        with self._lock:
+            value = self._load().get(section, default if key is None else {})
+            return value if key is None else value.get(key, default)
+
+    def update(self, section, **changes):
+        """Change keys of a top-level section."""
+        with self._lock:
+            self._load().setdefault(section, {}).update(changes)
+            self._mark_dirty()
+
+    def set_dyn(self, **changes):
+        """Change fields of the typed __DYN__ section."""
+        with self._lock:
+            self._load()
+            for key, value in changes.items():
+                setattr(self._dyn, key, value)
+            self._mark_dirty()
+
+    def _mark_dirty(self):
+        self._dirty = True
+        if not getattr(self._local, "depth", 0):
+            self.flush()
+
+    @contextmanager
+    def batch(self):
+        """Coalesce every change made inside the block into one write."""
+        self._local.depth = getattr(self._local, "depth", 0) + 1
+        try:
+            yield self
+        finally:
+            self._local.depth -= 1
+            if not self._local.depth:
+                self.flush()
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self._data.setdefault("__DYN__", {}).update(asdict(self._dyn))
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            try:
+                with open(tmp, "w") as f:
+                    f.write(json.dumps(self._data, indent=4))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except OSError as e:
+                print(f"BRD: Could not write settings.json: {e}")
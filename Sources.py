@@ -0,0 +1,181 @@
+"""
+Preset sources besides GitHub.
+
+settings.json lists mirrors in priority order:
+
+    "Sources": [
+        {"Name": "Studio share", "Url": "file:///mnt/presets"},
+        {"Name": "LAN mirror", "Url": "http://presets.lan:8000"}
+    ]
+
+A mirror is a directory laid out like the preset repository, with a
+manifest.json at its root, shared as is or served by any static HTTP
+server. seed_mirror() creates or refreshes one from the local download,
+so a studio pays for one WAN download instead of one per machine.
+
+Mirrors are asked for their manifest concurrently. A file is taken from
+the first mirror (by priority, or by answer time with
+Network.Race_Sources) whose manifest lists it with the expected git blob
+sha, and every copy is verified against that sha before it is used;
+GitHub stays the last resort.
+"""
+
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from . import Manifest
+from .Catalogs import CATALOG_FOLDER, catalog_of
+from .constants import BRD_CONST_DATA, settings
+from .Logger import log
+from .utils import file_url_path, get_session
+
+
+MANIFEST_TIMEOUT = (1, 3)
+# Upper bound for all mirrors together, also covers a hanging network share
+ANSWER_DEADLINE = 5.0
+
+
+def as_url(location):
+    if "://" not in location:
+        return Path(location).expanduser().resolve().as_uri()
+    return location.rstrip("/")
+
+
+def configured():
+    """[(name, root url)] of the configured mirrors, highest priority first."""
+    return [
+        (source.get("Name") or source["Url"], as_url(source["Url"]))
+        for source in settings.get("Sources", default=[])
+        if source.get("Url") and source.get("Enabled", True)
+    ]
+
+
+def read_manifest(root):
+    """Validated manifest of the mirror at root (a file:// or http(s) url)."""
+    url = f"{root}/{Manifest.MANIFEST_NAME}"
+    if url.startswith("file:"):
+        with open(file_url_path(url), "r") as f:
+            body = json.load(f)
+    else:
+        r = get_session().get(url, timeout=MANIFEST_TIMEOUT)
+        r.raise_for_status()
+        body = r.json()
+    return Manifest.load(body, url)
+
+
+def fetch_manifests():
+    """
+    Ask every configured mirror for its manifest at once.
+    Returns [(name, manifest)] of the mirrors that answered, in priority
+    order, or in answer order when Network.Race_Sources is set.
+    """
+    sources = configured()
+    if not sources:
+        return []
+
+    answers = []
+    lock = threading.Lock()
+
+    def _run(priority, name, root):
+        try:
+            manifest = read_manifest(root)
+        except Exception as e:
+            log.debug("Source %s unavailable: %s", name, e)
+            return
+        with lock:
+            answers.append((priority, name, manifest))
+
+    # Daemon threads, a share that never answers is simply left behind
+    threads = [
+        threading.Thread(target=_run, args=(i, name, root), name=f"BRD_Source_{i}", daemon=True)
+        for i, (name, root) in enumerate(sources)
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + ANSWER_DEADLINE
+    for thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+
+    with lock:
+        answered = list(answers)
+    if not settings.get("Network", "Race_Sources", default=False):
+        answered.sort(key=lambda a: a[0])
+    log.debug("Sources answered: %s", lambda: ", ".join(name for _, name, _ in answered))
+    return [(name, manifest) for _, name, manifest in answered]
+
+
+def alternatives(mirrors, version, name, sha):
+    """Urls of name in the mirrors whose manifest lists it with sha."""
+    urls = []
+    for _, manifest in mirrors:
+        for item in Manifest.listing(manifest, version):
+            if item["name"] == name and item["sha"] == sha:
+                urls.append(item["download_url"])
+    return urls
+
+
+def seed_mirror(target, index, job=None):
+    """
+    Copy the current preset download into target, laid out like the
+    preset repository, and rewrite its manifest.json. Files that are
+    already there with the same content are kept, so refreshing a mirror
+    only copies what changed; index (a HashIndex) makes that check a stat()
+    for files it has seen before. Runs on a worker, job reports progress.
+    Returns the names of the copied files.
+    """
+    dyn = settings.dyn
+    if not dyn.File_Location or not Path(dyn.File_Location).exists():
+        raise FileNotFoundError("preset.blend has not been downloaded yet")
+
+    # File_Location is the catalogs/ folder in the per-catalog layout
+    version_folder = Path(dyn.File_Location).parent
+    files = [
+        p for p in version_folder.iterdir()
+        if p.is_file() and p.suffix in (".blend", ".txt")
+    ]
+    catalogs = version_folder / CATALOG_FOLDER
+    if catalogs.is_dir():
+        files += [p for p in catalogs.iterdir() if catalog_of(p)]
+    # Lives at the Data/ root locally, inside the version folder upstream
+    cats = BRD_CONST_DATA.Folder / "blender_assets.cats.txt"
+    if cats.exists():
+        files.append(cats)
+
+    target = Path(target)
+    out = target / version_folder.name
+    out.mkdir(parents=True, exist_ok=True)
+
+    if job is not None:
+        job.set_phase("Seeding mirror", total_bytes=sum(p.stat().st_size for p in files))
+
+    copied = []
+    for src in files:
+        dst = out / (f"{CATALOG_FOLDER}/{src.name}" if catalog_of(src) else src.name)
+        dst.parent.mkdir(exist_ok=True)
+        size = src.stat().st_size
+        if (
+            dst.exists()
+            and dst.stat().st_size == size
+            and index.matches(dst, index.sha_of(src))
+        ):
+            if job is not None:
+                job.add_bytes(size)
+            continue
+        tmp = dst.with_name(dst.name + ".part")
+        try:
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, dst)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        index.record(dst, index.sha_of(src))
+        copied.append(dst.relative_to(out).as_posix())
+        if job is not None:
+            job.add_bytes(size)
+
+    Manifest.write_manifest(target)
+    return copied
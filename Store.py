@@ -0,0 +1,146 @@
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from .Logger import log
+
+
+class BlobStore:
+    """
+    Content-addressed store of downloaded files under Data/store, one blob
+    per git blob sha at store/<sha[:2]>/<sha>.blob. The .blob extension
+    keeps Blender's asset library scan from picking the copies up.
+
+    Version folders only hold links into it (a hardlink, else a symlink,
+    else a copy), so switching Blender versions or rolling back re-links a
+    file instead of downloading it again. Blobs are immutable: downloads
+    always replace the linked file, never write through it.
+    Least recently used blobs are evicted once the store exceeds max_bytes.
+    Last use times live in store/lru.json rather than in blob mtimes, which
+    a hardlink shares with the file in the version folder.
+    """
+
+    def __init__(self, folder, max_bytes=2 << 30):
+        self.folder = Path(folder)
+        self.max_bytes = max_bytes
+        self._lru = None
+        self._lock = threading.Lock()
+
+    def path(self, sha):
+        return self.folder / sha[:2] / f"{sha}.blob"
+
+    def has(self, sha):
+        return bool(sha) and self.path(sha).is_file()
+
+    def _load_lru(self):
+        if self._lru is None:
+            try:
+                with open(self.folder / "lru.json", "r") as f:
+                    self._lru = json.load(f)
+            except (OSError, ValueError):
+                self._lru = {}
+        return self._lru
+
+    def _touch(self, sha):
+        with self._lock:
+            self._load_lru()[sha] = time.time()
+
+    def save(self):
+        with self._lock:
+            if self._lru is None:
+                return
+            tmp = self.folder / "lru.json.tmp"
+            try:
+                with open(tmp, "w") as f:
+                    f.write(json.dumps(self._lru))
+                os.replace(tmp, self.folder / "lru.json")
+            except OSError as e:
+                log.warning("Could not write store index: %s", e)
+
+    def put(self, file, sha):
+        """Add a verified file to the store, sharing its inode when possible."""
+        blob = self.path(sha)
+        if not blob.exists():
+            try:
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                try:
+                    os.link(file, blob)
+                except OSError:
+                    tmp = blob.with_name(blob.name + ".tmp")
+                    shutil.copyfile(file, tmp)
+                    os.replace(tmp, blob)
+            except OSError as e:
+                log.warning("Could not add %s to the store: %s", Path(file).name, e)
+                return
+        self._touch(sha)
+
+    def materialize(self, sha, dest):
+        """
+        Make dest a link to (or copy of) the blob for sha.
+        Returns False if the store does not have it.
+        """
+        if not self.has(sha):
+            return False
+        blob = self.path(sha)
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp = dest.with_name(dest.name + ".link")
+        tmp.unlink(missing_ok=True)
+
+        try:
+            try:
+                os.link(blob, tmp)
+                how = "hardlink"
+            except OSError:
+                try:
+                    os.symlink(blob, tmp)
+                    how = "symlink"
+                except OSError:
+                    shutil.copyfile(blob, tmp)
+                    how = "copy"
+            os.replace(tmp, dest)
+        except OSError as e:
+            tmp.unlink(missing_ok=True)
+            log.debug("Could not restore %s from store: %s", dest.name, e)
+            return False
+
+        self._touch(sha)
+        log.debug("%s restored from store (%s)", dest.name, how)
+        return True
+
+    def evict(self, keep=()):
+        """
+        Remove least recently used blobs until the store fits max_bytes.
+        Blobs in keep (shas in use) are never removed. Returns the bytes freed.
+        """
+        if not self.folder.exists():
+            return 0
+
+        blobs = {p.stem: p for p in self.folder.glob("*/*.blob")}
+        sizes = {sha: p.stat().st_size for sha, p in blobs.items()}
+        total = sum(sizes.values())
+
+        with self._lock:
+            lru = self._load_lru()
+            # Forget blobs removed by hand
+            for sha in set(lru) - set(blobs):
+                del lru[sha]
+            order = sorted(blobs, key=lambda sha: lru.get(sha, 0))
+
+        freed = 0
+        for sha in order:
+            if total - freed <= self.max_bytes:
+                break
+            if sha in keep:
+                continue
+            blobs[sha].unlink(missing_ok=True)
+            freed += sizes[sha]
+            with self._lock:
+                lru.pop(sha, None)
+            log.debug("Store evicted %s (%s bytes)", sha[:12], sizes[sha])
+
+        self.save()
+        return freed
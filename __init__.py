@@ -1,18 +1,21 @@
 # Import necessary modules and classes from Blender and Python standard library
 import bpy
+import time
 from pathlib import Path, PurePath
 from bpy.app.handlers import persistent
-import bpy.utils.previews
-import json
-import threading
 
 # Import local modules from the add-on
-from .Preset import preset_help
-from .constants import BRD_CONST_DATA
+from .Preset import hold_current_preset, is_frozen, preset_help, relocate_presets
+from .Catalogs import catalog_cache, catalog_names
+from .constants import BRD_CONST_DATA, settings
+from .Jobs import jobs
+from .Logger import log
+from .Metrics import metrics
 from .utils import flatten
 
 # Import Panels module from the add-on (not used in the code)
 from . import Panels
+from .Panels.experimental import Dedup
 
 # Define information about the add-on (name, description, version, etc.)
 bl_info = {
@@ -30,18 +33,45 @@ bl_info = {
 # Initialize an empty dictionary to store preview collections for custom icons
 BRD_preview_collections = {}
 
+
+def social_icons():
+    """
+    Preview collection with the social media icons.
+    Loaded the first time the Socials tab is drawn rather than in register(),
+    so the images are not read on Blender's startup path.
+    """
+    if "Social_icons" not in BRD_preview_collections:
+        import bpy.utils.previews
+
+        pcoll = bpy.utils.previews.new()
+        icon_dir = PurePath(Path(__file__).parents[0], "icons")
+
+        for i in BRD_CONST_DATA.Socials:
+            pcoll.load(i.Name, str(PurePath(icon_dir, i.Icon)), "IMAGE")
+
+        BRD_preview_collections["Social_icons"] = pcoll
+    return BRD_preview_collections["Social_icons"]
+
 # Global variable to track whether the Blender session is starting
 BRD_SESSION = True
 
 # Define an updater function for the BRD_Preference class
-# It will save the "debugging" property to a JSON settings file when updated
+# It will save the "debugging" property to the settings store when updated
 def updater(self, context):
     print(self.debugging)
-    with open(BRD_CONST_DATA.Folder / "settings.json", "r") as f:
-        stuff = json.load(f)
-        stuff["__DYN__"]["Debug"] = self.debugging
-        with open(BRD_CONST_DATA.Folder / "settings.json", "w") as f:
-            f.write(json.dumps(stuff))
+    settings.set_dyn(Debug=self.debugging)
+    log.set_debug(self.debugging)
+
+
+# Not stored with the preferences: Metrics.Enabled in settings.json is the
+# one switch, also read by headless runs
+def metrics_get(self):
+    return metrics.is_enabled()
+
+
+def metrics_set(self, value):
+    metrics.set_enabled(value)
+
 
 # Custom Blender preference panel (AddonPreferences) for the add-on
 class BRD_Preference(bpy.types.AddonPreferences):
@@ -63,6 +93,21 @@ class BRD_Preference(bpy.types.AddonPreferences):
     # Boolean property for experimental features
     experimental: bpy.props.BoolProperty(default=False)
 
+    # Merge duplicate preset node groups automatically after an append
+    dedup_on_append: bpy.props.BoolProperty(
+        name="Merge Duplicates on Append",
+        description="Merge identical copies of preset node groups (G_Foo.001, ...) after they are appended",
+        default=False,
+    )
+
+    # Record timings of startup and updates into Data/metrics.json
+    metrics: bpy.props.BoolProperty(
+        name="Metrics",
+        description="Record where startup and update time goes and show a summary here",
+        get=metrics_get,
+        set=metrics_set,
+    )
+
     # Method to draw the preferences UI
     def draw(self, context):
         layout = self.layout
@@ -75,6 +120,7 @@ class BRD_Preference(bpy.types.AddonPreferences):
         # If the "Socials" tab is selected, show social media links
         if self.ui_tab == "Socials":
             col = box.column()
+            icons = social_icons()
 
             for i in BRD_CONST_DATA.Socials:
                 op = col.operator(
@@ -82,7 +128,7 @@ class BRD_Preference(bpy.types.AddonPreferences):
                     text=i.Name,
                     emboss=True,
                     depress=False,
-                    icon_value=BRD_preview_collections["Social_icons"][i.Name].icon_id,
+                    icon_value=icons[i.Name].icon_id,
                 )
                 op.url = i.Url
 
@@ -100,37 +146,78 @@ class BRD_Preference(bpy.types.AddonPreferences):
             row = col.row()
             row.operator("bradley.remove_asset", text="Remove Asset Library Path", icon="PANEL_CLOSE")
             row = col.row()
+            row.operator("bradley.seed_mirror", text="Seed Studio Mirror", icon="NETWORK_DRIVE")
+            row = col.row()
             row.prop(self, "debugging", toggle=True)
             row.prop(self, "experimental", toggle=True)
-
-
-def _do_network_update():
-    """Runs in background thread — no bpy calls allowed here"""
-    try:
-        bpy.ops.bradley.update()
-    except Exception as e:
-        print(f"BRD: Background update failed: {e}")
+            row.prop(self, "metrics", toggle=True)
+            if self.experimental:
+                row = col.row()
+                row.prop(self, "dedup_on_append", toggle=True)
+
+            # Per-catalog preset layout: what to keep downloaded
+            available = catalog_cache.available()
+            if available:
+                sub = col.column(align=True)
+                sub.label(text="Preset Catalogs")
+                wanted = catalog_cache.wanted()
+                local = catalog_cache.local()
+                touched = catalog_cache.touched()
+                names = catalog_names()
+                for uuid in sorted(available, key=lambda u: names.get(u, u)):
+                    row = sub.row()
+                    op = row.operator(
+                        "bradley.toggle_catalog",
+                        text=names.get(uuid, uuid),
+                        icon="CHECKBOX_HLT" if uuid in wanted else "CHECKBOX_DEHLT",
+                        emboss=False,
+                    )
+                    op.catalog = uuid
+                    if uuid in touched:
+                        row.label(text="In use")
+                    elif uuid in wanted and uuid not in local:
+                        row.label(text="Not downloaded")
+
+            if self.metrics:
+                sub = col.column(align=True)
+                for line in metrics.summary():
+                    sub.label(text=line)
+
+            # Background jobs (updates) with live progress
+            for job in jobs.active():
+                row = col.row()
+                text = f"{job.label}: {job.phase}"
+                if job.total_bytes:
+                    text += f" ({job.done_bytes / 1e6:.1f} / {job.total_bytes / 1e6:.1f} MB)"
+                row.progress(factor=job.factor(), type="BAR", text=text)
+                row.operator("bradley.cancel_job", text="", icon="CANCEL").key = job.key
 
 
 @persistent
+@metrics.recorded("load")
 def run_after_load(*dummy):
     global BRD_SESSION
 
-    # Relocate library — must stay on main thread (uses bpy)
-    if any("preset.blend" in a for a in [i.name for i in bpy.data.libraries]):
-        bpy.ops.wm.lib_relocate(
-            library=[s for s in [i.name for i in bpy.data.libraries] if "preset.blend" in s][0],
-            directory=str(PurePath(BRD_CONST_DATA.Folder, BRD_CONST_DATA.__DYN__.B_Version)),
-            filename="preset.blend",
-        )
+    Dedup.reset_tracking()
+
+    # Must stay on main thread (uses bpy)
+    with metrics.span("relocate libraries"):
+        relocate_presets()
 
     if BRD_SESSION:
         BRD_SESSION = False  # only run once on first startup, not on every file open
         bpy.ops.bradley.add_asset()  # keep on main thread (touches bpy preferences)
 
-        # Spin up the network update in the background — won't block Blender
-        thread = threading.Thread(target=_do_network_update, daemon=True)
-        thread.start()
+        if is_frozen():
+            # Provisioned node (see Provision.py), never touches the network,
+            # but other instances sharing Data/ must not remove its folder
+            log.debug("Presets frozen, no update")
+            if not hold_current_preset():
+                log.warning("Presets are frozen but none are provisioned")
+            return
+
+        # Queues the network update on the job engine — won't block Blender
+        bpy.ops.bradley.update()
 
 
 # Flatten a nested list of classes into a single list
@@ -144,32 +231,37 @@ classes = flatten(
 
 
 def register():
+    start = time.perf_counter()
     print("=" * 20)
     print(__package__)
     print("=" * 20)
 
-    # Create a new previews collection to store custom icons for social media links
-    pcoll = bpy.utils.previews.new()
-    icon_dir = PurePath(Path(__file__).parents[0], "icons")
-
-    for i in BRD_CONST_DATA.Socials:
-        pcoll.load(i.Name, str(PurePath(icon_dir, i.Icon)), "IMAGE")
-
-    BRD_preview_collections["Social_icons"] = pcoll
-
+    # Social icons are loaded lazily by social_icons()
     for i in classes:
         bpy.utils.register_class(i)
 
     bpy.app.handlers.load_post.append(run_after_load)
+    bpy.app.handlers.depsgraph_update_post.append(Dedup.on_depsgraph_update)
+
+    # Settings can't be read this early; the next recorded run picks it up
+    metrics.note_register((time.perf_counter() - start) * 1000)
 
 
 def unregister():
+    jobs.cancel_all()
+
     for i in classes:
         bpy.utils.unregister_class(i)
 
     # FIX: was incorrectly using append instead of remove
     if run_after_load in bpy.app.handlers.load_post:
         bpy.app.handlers.load_post.remove(run_after_load)
+    if Dedup.on_depsgraph_update in bpy.app.handlers.depsgraph_update_post:
+        bpy.app.handlers.depsgraph_update_post.remove(Dedup.on_depsgraph_update)
+
+    for pcoll in BRD_preview_collections.values():
+        bpy.utils.previews.remove(pcoll)
+    BRD_preview_collections.clear()
 
 
 if __name__ == "__main__":
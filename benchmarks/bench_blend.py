@@ -0,0 +1,81 @@
+"""
+.blend index benchmark: Blend.read_index() and BlendIndex lookups.
+
+Writes a synthetic preset.blend with `groups` node group assets behind
+`--size-mb` of block data (see blend_fixture.py) and measures indexing it
+from the file, loading the cached index of a sha in a fresh process
+state, and a find() by name.
+
+    python benchmarks/bench_blend.py [--groups 2000] [--size-mb 256] [--header legacy]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+
+def _ms(func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return result, round((time.perf_counter() - start) / repeat * 1000, 3)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--groups", type=int, default=2000)
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--header", choices=("legacy", "v1"), default="legacy")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(HERE))
+    import bpy_stub
+    from blend_fixture import write_blend
+
+    bpy_stub.install()
+    bpy_stub.load_addon()
+    Blend = sys.modules[bpy_stub.ADDON_NAME + ".Blend"]
+
+    tmp = Path(tempfile.mkdtemp(prefix="brd_bench_"))
+    catalogs = [str(uuid.uuid4()) for _ in range(16)]
+    path = write_blend(
+        tmp / "preset.blend",
+        {f"G_Preset_{i}": catalogs[i % 16] for i in range(args.groups)},
+        padding=args.size_mb << 20,
+        header=args.header,
+    )
+    sha = "0" * 40
+
+    index, read_ms = _ms(lambda: Blend.read_index(path))
+    _, cold_ms = _ms(lambda: Blend.BlendIndex(tmp / "index").get(path, sha))
+    # Cached on disk now: a new instance only reads the json
+    _, cached_ms = _ms(lambda: Blend.BlendIndex(tmp / "index").get(path, sha), 5)
+    warm = Blend.BlendIndex(tmp / "index")
+    warm.get(path, sha)
+    name = f"G_Preset_{args.groups // 2}"
+    _, find_ms = _ms(lambda: warm.find(path, sha, name), 10000)
+
+    results = {
+        "groups": args.groups,
+        "file_mb": round(path.stat().st_size / 1e6, 1),
+        "header": args.header,
+        "ids": len(index["ids"]),
+        "assets": len(Blend.assets(index, "NT")),
+        "read_index_ms": read_ms,
+        "index_and_cache_ms": cold_ms,
+        "cached_index_ms": cached_ms,
+        "find_us": round(find_ms * 1000, 3),
+    }
+    json.dump(results, sys.stdout, indent=4)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
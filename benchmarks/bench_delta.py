@@ -0,0 +1,156 @@
+"""
+Delta update benchmark against a local HTTP stand-in.
+
+Serves two versions of a synthetic .blend from a temporary directory over
+http.server (with Range support), publishes the block signature of the new
+version, and updates a copy of the old version with Delta.apply_delta().
+Reports bytes fetched vs. a full download for a few kinds of edits.
+
+    python benchmarks/bench_delta.py [--size-mb 64] [--block-size 65536]
+"""
+
+import argparse
+import importlib
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import types
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import requests
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_delta():
+    # Delta.py only needs the standard library and utils: load it from a bare
+    # package so the add-on's __init__ (and bpy) is never imported
+    package = types.ModuleType("brd_delta")
+    package.__path__ = [str(ROOT)]
+    sys.modules["brd_delta"] = package
+    return importlib.import_module("brd_delta.Delta")
+
+
+class RangeHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        path = self.translate_path(self.path)
+        if not match or not os.path.isfile(path):
+            return super().do_GET()
+
+        size = os.path.getsize(path)
+        start = int(match.group(1))
+        stop = int(match.group(2)) if match.group(2) else size - 1
+        if start >= size:
+            self.send_error(416)
+            return
+        stop = min(stop, size - 1)
+        with open(path, "rb") as f:
+            f.seek(start)
+            body = f.read(stop - start + 1)
+        self.send_response(206)
+        self.send_header("Content-Range", f"bytes {start}-{stop}/{size}")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _blend_like(size, seed):
+    # Sequence of "file blocks" with small headers, like a real .blend
+    rng = random.Random(seed)
+    out = bytearray(b"BLENDER-v402")
+    while len(out) < size:
+        n = rng.randint(64, 8192)
+        out += b"DATA" + n.to_bytes(4, "little") + rng.randbytes(n)
+    return bytes(out[:size])
+
+
+def _edits(old, rng):
+    third = len(old) // 3
+    insert = rng.randbytes(200_000)
+    return {
+        "in-place edit": old[:third] + rng.randbytes(4096) + old[third + 4096:],
+        "insertion": old[:third] + insert + old[third:],
+        "deletion": old[:third] + old[third + 300_000:],
+        # A re-save rewrites the block headers everywhere: the delta must
+        # give up quickly so the caller downloads the file instead
+        "re-saved": bytes(b ^ 1 if i % 4096 == 0 else b for i, b in enumerate(old)),
+        "scattered edits": b"".join(
+            chunk[:-512] + rng.randbytes(512) if i % 4 == 0 else chunk
+            for i, chunk in enumerate(old[j:j + (1 << 20)] for j in range(0, len(old), 1 << 20))
+        ),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--block-size", type=int, default=1 << 16)
+    args = parser.parse_args(argv)
+
+    delta = _load_delta()
+    rng = random.Random(0)
+    old = _blend_like(args.size_mb << 20, 1)
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        served = tmp / "served"
+        served.mkdir()
+        server = ThreadingHTTPServer(
+            ("127.0.0.1", 0), partial(RangeHandler, directory=str(served))
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_port}"
+        session = requests.Session()
+
+        try:
+            for name, new in _edits(old, rng).items():
+                (served / "preset.blend").write_bytes(new)
+                signature = delta.build_signature(served / "preset.blend", args.block_size)
+
+                local = tmp / "preset.blend"
+                local.write_bytes(old)
+
+                start = time.perf_counter()
+                try:
+                    fetched, reused = delta.apply_delta(
+                        session, f"{base}/preset.blend", local, local, signature
+                    )
+                except delta.DeltaError as e:
+                    fetched, reused, outcome = None, 0, f"full download: {e}"
+                else:
+                    assert local.read_bytes() == new
+                    outcome = "delta"
+                elapsed = time.perf_counter() - start
+
+                results.append(
+                    {
+                        "case": name,
+                        "size": len(new),
+                        "outcome": outcome,
+                        "fetched": fetched,
+                        "saved": reused,
+                        "saved_pct": round(reused * 100 / len(new), 2),
+                        "seconds": round(elapsed, 3),
+                    }
+                )
+        finally:
+            server.shutdown()
+
+    json.dump(results, sys.stdout, indent=4)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Import-time benchmark for the add-on, in the spirit of `python -X importtime`.
+
+Imports the add-on against the bpy stub, then calls register(), and fails
+(exit code 1) if register() takes longer than the budget or if startup did
+work that should be deferred to first use: importing requests or reading
+settings.json.
+
+    python benchmarks/bench_import.py [--budget-ms 20] [--repeat 5]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+
+def _measure():
+    sys.path.insert(0, str(HERE))
+    import bpy_stub
+
+    bpy_stub.install()
+
+    start = time.perf_counter()
+    addon = bpy_stub.load_addon()
+    imported = time.perf_counter()
+    addon.register()
+    registered = time.perf_counter()
+
+    result = {
+        "import_ms": round((imported - start) * 1000, 3),
+        "register_ms": round((registered - imported) * 1000, 3),
+        "requests_imported": "requests" in sys.modules,
+        "settings_loaded": sys.modules[bpy_stub.ADDON_NAME + ".constants"].settings._data is not None,
+    }
+    addon.unregister()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=20.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        json.dump(_measure(), sys.stdout)
+        return 0
+
+    # Every run in a fresh interpreter so nothing is already imported
+    runs = [
+        json.loads(
+            subprocess.run(
+                [sys.executable, __file__, "--child"],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.splitlines()[-1]
+        )
+        for _ in range(args.repeat)
+    ]
+
+    best = {
+        "import_ms": min(r["import_ms"] for r in runs),
+        "register_ms": min(r["register_ms"] for r in runs),
+        "requests_imported": any(r["requests_imported"] for r in runs),
+        "settings_loaded": any(r["settings_loaded"] for r in runs),
+        "budget_ms": args.budget_ms,
+    }
+    json.dump(best, sys.stdout, indent=4)
+    print()
+
+    failed = (
+        best["register_ms"] > args.budget_ms
+        or best["requests_imported"]
+        or best["settings_loaded"]
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
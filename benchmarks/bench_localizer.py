@@ -0,0 +1,98 @@
+"""
+Localizer benchmark on a synthetic, deeply nested node group file.
+
+Builds `depth` levels of `width` groups where every group uses every group
+of the next level (a heavily reused subgroup library), then compares the
+old recursive traversal of BRD_Node_Localizer (one walk per group-node
+occurrence) with Localizer.dependency_order().
+
+    python benchmarks/bench_localizer.py [--depth 9] [--width 3]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+
+class FakeNode:
+    def __init__(self, node_tree=None):
+        if node_tree is not None:
+            self.node_tree = node_tree
+
+
+class FakeTree:
+    def __init__(self, name):
+        self.name = self.name_full = name
+        self.nodes = [FakeNode()]
+
+
+def build(depth, width):
+    levels = [[FakeTree(f"G_{d}_{w}") for w in range(width)] for d in range(depth)]
+    for upper, lower in zip(levels, levels[1:]):
+        for tree in upper:
+            tree.nodes += [FakeNode(sub) for sub in lower]
+    root = FakeTree("Root")
+    root.nodes += [FakeNode(sub) for sub in levels[0]]
+    return root, sum(len(level) for level in levels)
+
+
+def old_recursive_find(context, noodles):
+    # The traversal BRD_Node_Localizer used before dependency_order()
+    for n in context.node_tree.nodes:
+        if hasattr(n, "node_tree"):
+            noodles.append(n.node_tree.name)
+            old_recursive_find(n, noodles)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--depth", type=int, default=9)
+    parser.add_argument("--width", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(HERE))
+    import bpy_stub
+
+    bpy_stub.install()
+    bpy_stub.load_addon()
+    from brd_addon.Panels.experimental.Localizer import _subgroups, dependency_order
+
+    root, n_groups = build(args.depth, args.width)
+
+    start = time.perf_counter()
+    noodles = []
+    old_recursive_find(type("Space", (), {"node_tree": root})(), noodles)
+    old = time.perf_counter() - start
+
+    start = time.perf_counter()
+    order = dependency_order(_subgroups(root))
+    new = time.perf_counter() - start
+
+    # Every group exactly once, and before everything it uses
+    position = {tree.name: i for i, tree in enumerate(order)}
+    assert len(order) == n_groups == len(set(noodles))
+    assert all(
+        position[tree.name] < position[sub.name] for tree in order for sub in _subgroups(tree)
+    )
+
+    json.dump(
+        {
+            "groups": n_groups,
+            "old_visits": len(noodles),
+            "old_seconds": round(old, 6),
+            "new_visits": len(order),
+            "new_seconds": round(new, 6),
+            "speedup": round(old / max(new, 1e-9), 1),
+        },
+        sys.stdout,
+        indent=4,
+    )
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Logger microbenchmark: the previous Logging.debug() against Logger.py.
+
+Measures the cost seen by the calling thread per log.debug() call, with
+debug output disabled (the normal case) and enabled, called from `depth`
+nested frames since the old caller lookup walked the whole stack.
+Console output goes to os.devnull.
+
+    python benchmarks/bench_logger.py [--calls 2000] [--depth 20]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+from inspect import getouterframes
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+
+class LegacyLogging:
+    # Logging.debug() before the rewrite, minus the colour codes
+    def __init__(self, dyn):
+        self.dyn = dyn
+
+    @staticmethod
+    def stack():
+        (frame, source, lineno, func, lines, index) = getouterframes(sys._getframe(1), 1)[-1]
+        return "bradley." + Path(source).stem
+
+    def debug(self, message, multi_line=False):
+        if self.dyn.Debug:
+            tm = time.strftime("%d-%m-%Y %H:%M:%S") + ":" + str(round(time.time() * 1000))
+            print(f"[{tm}] | DEBUG | " + str(self.stack()) + " | " + message)
+
+
+def _nested(depth, func):
+    if depth:
+        return _nested(depth - 1, func)
+    return func()
+
+
+def _time(calls, depth, call):
+    def run():
+        start = time.perf_counter()
+        for i in range(calls):
+            call(i)
+        return time.perf_counter() - start
+
+    return round(_nested(depth, run) / calls * 1e6, 3)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--depth", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, str(HERE))
+    import bpy_stub
+
+    bpy_stub.install()
+    bpy_stub.load_addon()
+    Logger = sys.modules[bpy_stub.ADDON_NAME + ".Logger"]
+    dyn = sys.modules[bpy_stub.ADDON_NAME + ".constants"].settings.dyn
+
+    new = Logger.Logging()
+    new._file_config = {}
+    old = LegacyLogging(dyn)
+    payload = {"sha": "0" * 40, "size": 123456}
+
+    results = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for debug in (False, True):
+            dyn.Debug = debug
+            new.set_debug(debug)
+            key = "enabled" if debug else "disabled"
+
+            results[f"old_{key}_us"] = _time(
+                args.calls, args.depth, lambda i: old.debug(f"artifact {i}: {payload}")
+            )
+            results[f"new_{key}_us"] = _time(
+                args.calls, args.depth, lambda i: new.debug("artifact %s: %s", i, payload)
+            )
+            # The console I/O the caller no longer waits for
+            start = time.perf_counter()
+            new.flush()
+            results[f"new_{key}_drain_us"] = round(
+                (time.perf_counter() - start) / args.calls * 1e6, 3
+            )
+
+    results["calls"] = args.calls
+    results["depth"] = args.depth
+    json.dump(results, sys.stdout, indent=4)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""
+Update pipeline benchmark against a local GitHub stand-in.
+
+Stages a copy of the add-on in a temporary directory, points it at
+github_standin.py and runs Preset._run_update() under the bpy stub for:
+
+    cold           empty Data/, full download
+    warm_gated     right after, stopped by the freshness TTL (no network)
+    warm_check     TTL expired, everything already up to date
+    forced         forced re-download
+    rate_limited   API answers 403 / 429 and there is no manifest
+    rate_limited_retry
+                   the next startup, held back by the circuit breaker
+
+Prints one JSON document (also written to --out) with wall time, requests
+per endpoint, bytes served, the preset bytes on disk and the recorded
+metrics spans of every scenario, so runs can be compared across commits.
+--split serves the per-catalog layout with --catalogs of its eight
+catalogs enabled.
+
+    python benchmarks/bench_update.py [--size-mb 8] [--latency-ms 0]
+        [--bandwidth-mbps 0] [--drop-after 0] [--no-manifest]
+        [--split] [--catalogs 2] [--rate-limit-status 403] [--out results.json]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+
+def _disk_bytes(data):
+    # Version folders only, the store holds blobs of every layout seen
+    return sum(
+        p.stat().st_size
+        for folder in data.iterdir()
+        if folder.is_dir() and folder.name[:1].isdigit()
+        for p in folder.rglob("*.blend")
+    )
+
+
+def _scenario(name, preset, standin, data, call):
+    standin.reset_counters()
+    start = time.perf_counter()
+    ok = call()
+    elapsed = time.perf_counter() - start
+
+    spans = []
+    try:
+        with open(data / "metrics.json", "r") as f:
+            last = json.load(f)[-1]
+        if last["started"] >= time.time() - elapsed - 1:
+            spans = last["spans"]
+    except (OSError, ValueError, IndexError):
+        pass
+
+    return {
+        "scenario": name,
+        "ok": bool(ok),
+        "ms": round(elapsed * 1000, 3),
+        "requests": dict(standin.requests),
+        "bytes_served": standin.bytes_sent,
+        "disk_bytes": _disk_bytes(data),
+        "breaker_open": preset.scheduler.is_open(),
+        "spans": spans,
+    }
+
+
+def _suite(args, rate_limited):
+    sys.path.insert(0, str(HERE))
+    import bpy_stub
+    from github_standin import Faults, GitHubStandIn, make_remote
+
+    tmp = Path(tempfile.mkdtemp(prefix="brd_bench_"))
+    remote = make_remote(tmp / "remote", size=args.size_mb << 20, split=args.split)
+
+    if rate_limited:
+        faults = Faults(rate_limited=args.rate_limit_status, manifest=False)
+    else:
+        faults = Faults(
+            latency=args.latency_ms / 1000,
+            bandwidth=int(args.bandwidth_mbps * 125_000),
+            drop_after=args.drop_after,
+            manifest=not args.no_manifest,
+        )
+    standin = GitHubStandIn(remote, faults=faults).start()
+
+    overrides = standin.settings()
+    overrides["Metrics"] = {"Enabled": True}
+    if args.split:
+        cats = (remote / "5.0" / "blender_assets.cats.txt").read_text().splitlines()[1:]
+        overrides["Catalogs"] = {"Enabled": [line.split(":")[0] for line in cats[:args.catalogs]]}
+    addon_root = bpy_stub.stage(tmp / "addon", overrides)
+
+    bpy_stub.install()
+    bpy_stub.load_addon(root=addon_root)
+    preset = sys.modules[bpy_stub.ADDON_NAME + ".Preset"]
+    settings = sys.modules[bpy_stub.ADDON_NAME + ".constants"].settings
+    data = addon_root / "Data"
+
+    results = []
+    try:
+        if rate_limited:
+            results.append(_scenario("rate_limited", preset, standin, data, preset._run_update))
+            results.append(
+                _scenario("rate_limited_retry", preset, standin, data, preset._run_update)
+            )
+        else:
+            results.append(_scenario("cold", preset, standin, data, preset._run_update))
+            results.append(_scenario("warm_gated", preset, standin, data, preset._run_update))
+            settings.set_dyn(Last_Check=0)
+            results.append(_scenario("warm_check", preset, standin, data, preset._run_update))
+            results.append(
+                _scenario(
+                    "forced", preset, standin, data, lambda: preset._run_update(force=True)
+                )
+            )
+    finally:
+        standin.stop()
+    return results
+
+
+def _git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=HERE,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--bandwidth-mbps", type=float, default=0)
+    parser.add_argument("--drop-after", type=int, default=0, help="cut each raw download once after N bytes")
+    parser.add_argument("--no-manifest", action="store_true", help="force the contents API path")
+    parser.add_argument("--split", action="store_true", help="serve the per-catalog layout")
+    parser.add_argument("--catalogs", type=int, default=2, help="catalogs enabled with --split")
+    parser.add_argument("--rate-limit-status", type=int, default=403, choices=(403, 429))
+    parser.add_argument("--out", type=Path)
+    parser.add_argument("--child", choices=("update", "rate_limited"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        results = _suite(args, rate_limited=args.child == "rate_limited")
+        # The add-on prints to stdout too, the results are the last line
+        print()
+        print(json.dumps(results))
+        return 0
+
+    # Each suite in a fresh interpreter: new sessions, caches and settings
+    forwarded = [a for a in (argv if argv is not None else sys.argv[1:])]
+    scenarios = []
+    for child in ("update", "rate_limited"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--child", child] + forwarded,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        scenarios += json.loads(out.splitlines()[-1])
+
+    report = {
+        "revision": _git_revision(),
+        "config": {
+            "size_mb": args.size_mb,
+            "latency_ms": args.latency_ms,
+            "bandwidth_mbps": args.bandwidth_mbps,
+            "drop_after": args.drop_after,
+            "manifest": not args.no_manifest,
+            "split": args.split,
+            "catalogs": args.catalogs if args.split else None,
+            "rate_limit_status": args.rate_limit_status,
+        },
+        "scenarios": scenarios,
+    }
+    json.dump(report, sys.stdout, indent=4)
+    print()
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=4)
+
+    failed = [s["scenario"] for s in scenarios if s["scenario"] in ("cold", "forced") and not s["ok"]]
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
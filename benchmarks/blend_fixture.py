@@ -0,0 +1,143 @@
+"""
+Writer for small synthetic .blend files.
+
+Produces the block layout Blend.py reads (header, ID blocks, asset
+metadata, DNA1, ENDB) with a minimal SDNA, so the reader, the download
+validation and the benchmarks can run without Blender or real presets.
+"""
+
+import struct
+import uuid
+
+# Struct definitions: (type, [(member type, member name)])
+_STRUCTS = [
+    (
+        "bUUID",
+        [
+            ("int", "time_low"),
+            ("short", "time_mid"),
+            ("short", "time_hi_and_version"),
+            ("char", "clock_seq_hi_and_reserved"),
+            ("char", "clock_seq_low"),
+            ("char", "node[6]"),
+        ],
+    ),
+    (
+        "AssetMetaData",
+        [
+            ("void", "*local_type_info"),
+            ("bUUID", "catalog_id"),
+            ("char", "catalog_simple_name[64]"),
+        ],
+    ),
+    (
+        "ID",
+        [
+            ("void", "*next"),
+            ("void", "*prev"),
+            ("ID", "*newid"),
+            ("void", "*lib"),
+            ("AssetMetaData", "*asset_data"),
+            ("char", "name[{name}]"),
+            ("char", "_pad0[{pad}]"),
+        ],
+    ),
+    ("bNodeTree", [("ID", "id"), ("char", "idname[64]")]),
+]
+_BASIC = [("char", 1), ("short", 2), ("int", 4), ("void", 0)]
+
+
+def _sdna(name_size, pointer_size, e):
+    pad = -(5 * pointer_size + name_size) % 8
+    structs = [
+        (t, [(mt, mn.format(name=name_size, pad=pad)) for mt, mn in members])
+        for t, members in _STRUCTS
+    ]
+    types = [t for t, _ in _BASIC] + [t for t, _ in structs]
+    names = []
+    for _, members in structs:
+        for _, name in members:
+            if name not in names:
+                names.append(name)
+
+    lengths = dict(_BASIC)
+    for t, members in structs:
+        size = 0
+        for mt, name in members:
+            count = 1
+            for dim in name.replace("]", "").split("[")[1:]:
+                count *= int(dim)
+            size += (pointer_size if name.startswith("*") else lengths[mt]) * count
+        lengths[t] = size
+
+    def strings(items):
+        out = b"".join(i.encode() + b"\0" for i in items)
+        return struct.pack(e + "i", len(items)) + out + b"\0" * (-len(out) % 4)
+
+    dna = b"SDNA" + b"NAME" + strings(names) + b"TYPE" + strings(types)
+    tlen = struct.pack(f"{e}{len(types)}H", *(lengths[t] for t in types))
+    dna += b"TLEN" + tlen + b"\0" * (-len(tlen) % 4)
+    dna += b"STRC" + struct.pack(e + "i", len(structs))
+    for t, members in structs:
+        dna += struct.pack(e + "hh", types.index(t), len(members))
+        for mt, name in members:
+            dna += struct.pack(e + "hh", types.index(mt), names.index(name))
+    index = {t: i for i, (t, _) in enumerate(structs)}
+    return dna, lengths, index
+
+
+def write_blend(path, groups, padding=0, header="legacy", endian="<", pointer_size=8):
+    """
+    Write a .blend with one node group per entry of groups, a dict of
+    {name: catalog UUID string or None}; groups with a catalog are marked
+    as assets. padding adds a DATA block of that many zero bytes.
+    header is "legacy" (12 bytes, like Blender 4.x) or "v1" (Blender 5.0).
+    """
+    if header == "v1":
+        e, pointer_size, name_size = "<", 8, 258
+        head = b"BLENDER17-01v0500"
+    else:
+        e, name_size = endian, 66
+        head = b"BLENDER" + (b"-" if pointer_size == 8 else b"_") + (b"v" if e == "<" else b"V")
+        head += b"405"
+    dna, lengths, index = _sdna(name_size, pointer_size, e)
+    ptr = "Q" if pointer_size == 8 else "I"
+
+    def bhead(code, sdna, old, length, nr=1):
+        if header == "v1":
+            return struct.pack("<4siQqq", code, sdna, old, length, nr)
+        return struct.pack(f"{e}4si{ptr}ii", code, length, old, sdna, nr)
+
+    out = [head, bhead(b"GLOB", 0, 0, 8), b"\0" * 8]
+    address = 0x1000
+    for name, catalog in groups.items():
+        tree = bytearray(lengths["bNodeTree"])
+        meta_address = address + 0x800 if catalog else 0
+        struct.pack_into(e + ptr, tree, 4 * pointer_size, meta_address)
+        encoded = b"NT" + name.encode()
+        tree[5 * pointer_size:5 * pointer_size + len(encoded)] = encoded
+        idname = b"GeometryNodeTree"
+        start = lengths["ID"]
+        tree[start:start + len(idname)] = idname
+        out += [bhead(b"NT\0\0", index["bNodeTree"], address, len(tree)), bytes(tree)]
+
+        if catalog:
+            meta = bytearray(lengths["AssetMetaData"])
+            meta[pointer_size:pointer_size + 16] = _uuid_bytes(catalog, e)
+            out += [bhead(b"DATA", index["AssetMetaData"], meta_address, len(meta)), bytes(meta)]
+        address += 0x1000
+
+    if padding:
+        out += [bhead(b"DATA", 0, address, padding), bytes(padding)]
+    out += [bhead(b"DNA1", 0, 0, len(dna)), dna, bhead(b"ENDB", 0, 0, 0)]
+
+    with open(path, "wb") as f:
+        for part in out:
+            f.write(part)
+    return path
+
+
+def _uuid_bytes(text, e):
+    u = uuid.UUID(text)
+    f = u.fields
+    return struct.pack(e + "IHHBB", *f[:5]) + f[5].to_bytes(6, "big")
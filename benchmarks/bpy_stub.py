@@ -0,0 +1,171 @@
+"""
+Minimal stand-in for Blender's `bpy` module.
+
+Just enough of the API for the add-on to be imported and registered from a
+plain Python interpreter, so startup cost and the update pipeline can be
+measured without Blender. Install it with install() before loading the
+add-on with load_addon().
+"""
+
+import importlib.util
+import json
+import shutil
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+ADDON_NAME = "brd_addon"
+
+
+class _Struct:
+    """Base for bpy.types classes; accepts and ignores everything."""
+
+    bl_rna = None
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+
+class _Handlers:
+    def __init__(self):
+        self.load_post = []
+        self.save_pre = []
+        self.depsgraph_update_post = []
+
+    @staticmethod
+    def persistent(func):
+        return func
+
+
+class _Operators:
+    """bpy.ops: every bpy.ops.<area>.<name>() call is recorded and returns FINISHED."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, area):
+        ops = self
+
+        class _Area:
+            def __getattr__(self, name):
+                def call(*args, **kwargs):
+                    ops.calls.append((f"{area}.{name}", args, kwargs))
+                    return {"FINISHED"}
+
+                return call
+
+        return _Area()
+
+
+def _prop(*args, **kwargs):
+    return ("prop", kwargs)
+
+
+def build(version=(5, 0, 0), background=False):
+    """Return a fresh stub `bpy` module tree."""
+    bpy = types.ModuleType("bpy")
+    registered = []
+
+    bpy.types = types.ModuleType("bpy.types")
+    for name in ("Operator", "Panel", "AddonPreferences", "PropertyGroup", "UIList", "Menu"):
+        setattr(bpy.types, name, type(name, (_Struct,), {}))
+
+    bpy.props = types.ModuleType("bpy.props")
+    for name in (
+        "BoolProperty",
+        "EnumProperty",
+        "IntProperty",
+        "FloatProperty",
+        "StringProperty",
+        "PointerProperty",
+        "CollectionProperty",
+    ):
+        setattr(bpy.props, name, _prop)
+
+    handlers = _Handlers()
+    bpy.app = types.ModuleType("bpy.app")
+    bpy.app.version = version
+    bpy.app.version_string = "%d.%d.%d" % version
+    bpy.app.background = background
+    bpy.app.handlers = types.ModuleType("bpy.app.handlers")
+    bpy.app.handlers.persistent = handlers.persistent
+    bpy.app.handlers.load_post = handlers.load_post
+    bpy.app.handlers.save_pre = handlers.save_pre
+    bpy.app.handlers.depsgraph_update_post = handlers.depsgraph_update_post
+    bpy.app.timers = types.SimpleNamespace(
+        register=lambda func, first_interval=0, persistent=False: None,
+        unregister=lambda func: None,
+        is_registered=lambda func: False,
+    )
+
+    bpy.utils = types.ModuleType("bpy.utils")
+    bpy.utils.register_class = registered.append
+    bpy.utils.unregister_class = registered.remove
+    bpy.utils.registered = registered
+    bpy.utils.previews = types.ModuleType("bpy.utils.previews")
+    bpy.utils.previews.new = lambda: {}
+    bpy.utils.previews.remove = lambda pcoll: None
+
+    bpy.ops = _Operators()
+    bpy.data = types.SimpleNamespace(libraries=[], node_groups=[])
+    bpy.context = types.SimpleNamespace(
+        preferences=types.SimpleNamespace(
+            filepaths=types.SimpleNamespace(asset_libraries=[]),
+            addons={},
+        )
+    )
+    bpy.path = types.SimpleNamespace(abspath=lambda p, **kwargs: p)
+    return bpy
+
+
+def install(version=(5, 0, 0), background=False):
+    """Put a stub bpy (and its submodules) into sys.modules."""
+    bpy = build(version, background)
+    sys.modules["bpy"] = bpy
+    for name in ("types", "props", "app", "utils", "ops"):
+        sys.modules[f"bpy.{name}"] = getattr(bpy, name)
+    sys.modules["bpy.app.handlers"] = bpy.app.handlers
+    sys.modules["bpy.utils.previews"] = bpy.utils.previews
+    return bpy
+
+
+def stage(dest, settings=None):
+    """
+    Copy the add-on into dest so a benchmark can write to its Data/ folder
+    without touching the repository. settings ({section: {key: value}}) is
+    merged into the copied Data/settings.json. Returns dest.
+    """
+    dest = Path(dest)
+    shutil.copytree(
+        ROOT,
+        dest,
+        ignore=shutil.ignore_patterns(".git", "benchmarks", "__pycache__", "*.part"),
+        dirs_exist_ok=True,
+    )
+    if settings:
+        path = dest / "Data" / "settings.json"
+        with open(path, "r") as f:
+            data = json.load(f)
+        for section, values in settings.items():
+            if isinstance(values, dict):
+                data.setdefault(section, {}).update(values)
+            else:
+                data[section] = values
+        with open(path, "w") as f:
+            json.dump(data, f, indent=4)
+    return dest
+
+
+def load_addon(name=ADDON_NAME, root=ROOT):
+    """Import the add-on package from root (the repository by default) under name."""
+    if name in sys.modules:
+        return sys.modules[name]
+    root = Path(root)
+    spec = importlib.util.spec_from_file_location(
+        name, root / "__init__.py", submodule_search_locations=[str(root)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
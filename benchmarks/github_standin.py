@@ -0,0 +1,336 @@
+"""
+Local stand-in for the GitHub endpoints the add-on talks to.
+
+Serves a preset repository laid out on disk (version folders with files)
+through http.server:
+
+    /api/rate_limit                          GET / HEAD
+    /api/repos/<repo>/contents/              version folders
+    /api/repos/<repo>/contents/<version>     files, with git blob shas
+    /raw/<repo>/HEAD/manifest.json           static manifest
+    /raw/<repo>/HEAD/<version>/<file>        raw files, with Range support
+
+Contents listings carry an ETag and answer If-None-Match with 304 like
+GitHub does. Faults can be injected per server: added latency, a
+bandwidth cap, 403 / 429 rate limiting of the API, dropping every raw
+download once after a number of bytes, and a missing manifest.
+"""
+
+import hashlib
+import importlib
+import json
+import re
+import sys
+import threading
+import time
+import types
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_manifest_module():
+    # Manifest.py only needs the standard library and utils: load it from a
+    # bare package so the add-on's __init__ (and bpy) is never imported
+    package = types.ModuleType("brd_manifest")
+    package.__path__ = [str(ROOT)]
+    sys.modules["brd_manifest"] = package
+    return importlib.import_module("brd_manifest.Manifest")
+
+
+Manifest = _load_manifest_module()
+
+
+class Faults:
+    def __init__(
+        self, latency=0.0, bandwidth=0, rate_limited=None, drop_after=0, manifest=True
+    ):
+        self.latency = latency  # seconds added to every response
+        self.bandwidth = bandwidth  # bytes/s for raw downloads, 0 = unlimited
+        self.rate_limited = rate_limited  # None, 403 or 429 for every API call
+        self.drop_after = drop_after  # bytes before the first GET of a file is cut
+        self.manifest = manifest
+
+
+class GitHubStandIn:
+    def __init__(self, remote, repo="brd/presets", faults=None):
+        self.remote = Path(remote)
+        self.repo = repo
+        self.faults = faults or Faults()
+        self.requests = Counter()
+        self.bytes_sent = 0
+        self._dropped = set()
+        self._shas = {}
+        self._manifest = None
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def base(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def settings(self):
+        """settings.json overrides that point the add-on at this server."""
+        return {
+            "Github": {
+                "Repository": self.repo,
+                "Api": f"{self.base}/api",
+                "Manifest": f"{self.base}/raw/{{repo}}/HEAD/manifest.json",
+            }
+        }
+
+    def start(self):
+        standin = self
+
+        class Handler(_Handler):
+            server_state = standin
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests.clear()
+            self.bytes_sent = 0
+
+    def count(self, endpoint, n=0):
+        with self._lock:
+            if endpoint:
+                self.requests[endpoint] += 1
+            self.bytes_sent += n
+
+    def _blob_sha(self, path):
+        # Hashed once, so server time doesn't show up in the measurements
+        sha = self._shas.get(path)
+        if sha is None:
+            sha = self._shas[path] = Manifest.git_blob_sha(path)
+        return sha
+
+    def manifest(self):
+        if self._manifest is None:
+            self._manifest = Manifest.build_manifest(self.remote)
+        return self._manifest
+
+    def listing(self, version=None):
+        raw = f"{self.base}/raw/{self.repo}/HEAD"
+        if version is None:
+            return [
+                {"name": p.name, "type": "dir"}
+                for p in sorted(self.remote.iterdir())
+                if p.is_dir()
+            ]
+        folder = self.remote / version
+        if not folder.is_dir():
+            return None
+        return [
+            {
+                "name": p.name,
+                "type": "file",
+                "sha": self._blob_sha(p),
+                "size": p.stat().st_size,
+                "download_url": f"{raw}/{version}/{p.name}",
+            }
+            for p in sorted(folder.iterdir())
+            if p.is_file()
+        ]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_state = None
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; avoid Nagle / delayed ACK stalls
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def do_HEAD(self):
+        self._route(head=True)
+
+    def do_GET(self):
+        self._route(head=False)
+
+    def _route(self, head):
+        state = self.server_state
+        faults = state.faults
+        if faults.latency:
+            time.sleep(faults.latency)
+
+        path = self.path.split("?", 1)[0]
+        if path.startswith("/api/"):
+            self._api(path[len("/api"):], head)
+        elif path.startswith("/raw/"):
+            self._raw(path[len("/raw/"):], head)
+        else:
+            self._send_json(404, {"message": "Not Found"}, head)
+
+    def _send_json(self, status, body, head=False, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data) if status != 304 else 0))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        if not head and status != 304:
+            self.wfile.write(data)
+            self.server_state.count(None, len(data))
+
+    def _api(self, path, head):
+        state = self.server_state
+        faults = state.faults
+        reset = int(time.time()) + 3600
+
+        if path == "/rate_limit":
+            state.count("rate_limit")
+            remaining = 0 if faults.rate_limited else 5000
+            self._send_json(
+                200, {"resources": {"core": {"remaining": remaining, "reset": reset}}}, head
+            )
+            return
+
+        state.count("contents")
+        if faults.rate_limited:
+            self._send_json(
+                faults.rate_limited,
+                {"message": "API rate limit exceeded"},
+                head,
+                {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)},
+            )
+            return
+
+        match = re.fullmatch(rf"/repos/{re.escape(state.repo)}/contents/([^/]*)", path)
+        body = state.listing(match.group(1) or None) if match else None
+        if body is None:
+            self._send_json(404, {"message": "Not Found"}, head)
+            return
+
+        etag = '"%s"' % hashlib.sha1(json.dumps(body).encode()).hexdigest()
+        headers = {"ETag": etag, "X-RateLimit-Remaining": "4999"}
+        if self.headers.get("If-None-Match") == etag:
+            # Conditional hits don't count against the quota on GitHub
+            state.count("contents_304")
+            self._send_json(304, None, head, headers)
+            return
+        self._send_json(200, body, head, headers)
+
+    def _raw(self, path, head):
+        state = self.server_state
+        prefix = f"{state.repo}/HEAD/"
+        if not path.startswith(prefix):
+            self._send_json(404, {"message": "Not Found"}, head)
+            return
+        relative = path[len(prefix):]
+
+        if relative == Manifest.MANIFEST_NAME:
+            state.count("manifest")
+            if not state.faults.manifest:
+                self._send_json(404, {"message": "Not Found"}, head)
+                return
+            self._send_json(200, state.manifest(), head)
+            return
+
+        file = state.remote / relative
+        if ".." in relative or not file.is_file():
+            self._send_json(404, {"message": "Not Found"}, head)
+            return
+        state.count("raw")
+        self._send_file(file, relative, head)
+
+    def _send_file(self, file, key, head):
+        state = self.server_state
+        faults = state.faults
+        size = file.stat().st_size
+        start, stop = 0, size - 1
+
+        match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if match:
+            start = int(match.group(1))
+            if match.group(2):
+                stop = min(int(match.group(2)), size - 1)
+            if start >= size:
+                self.send_response(416)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{stop}/{size}")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(stop - start + 1))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        if head:
+            return
+
+        drop_at = None
+        if faults.drop_after and key not in state._dropped:
+            state._dropped.add(key)
+            drop_at = start + faults.drop_after
+
+        chunk = 1 << 16
+        with open(file, "rb") as f:
+            f.seek(start)
+            offset = start
+            while offset <= stop:
+                n = min(chunk, stop - offset + 1)
+                if drop_at is not None and offset + n > drop_at:
+                    # Send part of it, then cut the connection mid-body
+                    part = f.read(max(0, drop_at - offset))
+                    self.wfile.write(part)
+                    state.count(None, len(part))
+                    self.close_connection = True
+                    self.connection.shutdown(2)
+                    return
+                data = f.read(n)
+                self.wfile.write(data)
+                state.count(None, len(data))
+                offset += n
+                if faults.bandwidth:
+                    time.sleep(n / faults.bandwidth)
+
+
+def make_remote(folder, versions=("4.2", "5.0"), size=8 << 20, seed=0, groups=64, split=False):
+    """
+    Write a synthetic preset repository into folder and return it: per
+    version a structurally valid preset.blend of about size bytes with
+    node group assets spread over eight catalogs, and its cats.txt.
+    With split, the per-catalog layout instead: catalogs/<uuid>.blend of
+    about size / 8 bytes each.
+    """
+    import random
+    import uuid
+
+    from blend_fixture import write_blend
+
+    folder = Path(folder)
+    rng = random.Random(seed)
+    for version in versions:
+        out = folder / version
+        out.mkdir(parents=True, exist_ok=True)
+        catalogs = [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(8)]
+        presets = {f"G_Preset_{version}_{i}": catalogs[i % 8] for i in range(groups)}
+        # Block data of the groups and the SDNA are a few hundred bytes each
+        padding = max(0, size - groups * 600 - 2048)
+        if split:
+            (out / "catalogs").mkdir(exist_ok=True)
+            for catalog in catalogs:
+                write_blend(
+                    out / "catalogs" / f"{catalog}.blend",
+                    {name: c for name, c in presets.items() if c == catalog},
+                    padding=padding // 8,
+                )
+        else:
+            write_blend(out / "preset.blend", presets, padding=padding)
+        (out / "blender_assets.cats.txt").write_text(
+            "VERSION 1\n" + "".join(f"{c}:Cat{i}:Cat{i}\n" for i, c in enumerate(catalogs))
+        )
+    return folder
@@ -1,31 +1,20 @@
-from pathlib import Path, PurePath
+from pathlib import Path
 import bpy
-from .Dtcls import BRD_Datas, __DYN__, Social
-import json
+from .Dtcls import BRD_Datas
+from .Settings import Settings
 
 Folder = Path(Path(__file__).parents[0], "Data")
 
-with open(PurePath(Folder, "settings.json"), "r") as f:
-    stuff = json.loads(f.read())
-
-repo = stuff["Github"]["Repository"]
+# Single owner of settings.json for the whole add-on.
+# Nothing is read from disk until a setting is first accessed.
+settings = Settings(Folder / "settings.json")
 
 # Always use local Blender version — no network call here
 version = str(bpy.app.version_string)[0:3]
 
-# Make sure the folder exists
-Path(PurePath(Folder, version)).mkdir(parents=True, exist_ok=True)
-
 BRD_CONST_DATA = BRD_Datas(
     __package__,
-    [Social(**i) for i in stuff["Socials"]],
-    f"https://api.github.com/repos/{repo}/contents/{version}",
     Folder,
-    __DYN__(
-        stuff["__DYN__"]["P_Version"],
-        version,
-        stuff["__DYN__"]["New"],
-        stuff["__DYN__"]["Debug"],
-        stuff["__DYN__"]["sha"],
-    ),
-)
\ No newline at end of file
+    version,
+    settings,
+)
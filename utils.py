@@ -1,15 +1,105 @@
-import requests
+import hashlib
+import mmap
+import os
+from pathlib import Path
 
 
-def connected_to_internet(url="https://github.com/", timeout=2):
+_session = None
+
+
+def get_session():
+    """
+    Shared keep-alive session used for every GitHub request.
+    One pooled connection per host is reused for the connectivity probe,
+    rate limit check, contents listings and file downloads, so an update
+    pays for a TCP+TLS handshake once per host instead of once per call.
+    """
+    global _session
+    if _session is None:
+        # requests is imported on first use, not on Blender's startup path
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=3,
+            connect=1,
+            read=2,
+            status=2,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        # api.github.com, raw.githubusercontent.com and github.com; enough
+        # connections per host for the parallel artifact downloads
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["User-Agent"] = "Bradley-Presets-Add-on"
+        _session = session
+    return _session
+
+
+def connection_stats():
+    """Return (requests sent, connections opened) across the shared pool."""
+    n_requests = n_connections = 0
+    if _session is None:
+        return n_requests, n_connections
+    for adapter in set(_session.adapters.values()):
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            n_requests += pool.num_requests
+            n_connections += pool.num_connections
+    return n_requests, n_connections
+
+
+def connected_to_internet(url="https://api.github.com/rate_limit", timeout=2):
+    # Probe the API host itself so the connection is kept alive and reused
+    # by the rate limit check and contents listings that follow.
+    # /rate_limit does not count against the quota.
+    import requests
+
     try:
-        _ = requests.head(url, timeout=timeout)
+        _ = get_session().head(url, timeout=timeout)
         return True
     except requests.ConnectionError:
         print("+" * 30)
     return False
 
 
+def git_blob_sha(path):
+    """SHA-1 of a file as git hashes a blob, comparable to the GitHub API `sha`."""
+    size = os.path.getsize(path)
+    h = hashlib.sha1(b"blob %d\0" % size)
+    if size:
+        # Hash straight from the page cache without copying into Python
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            h.update(m)
+    return h.hexdigest()
+
+
+def file_url_path(url):
+    """
+    Local path of a file:// url. Keeps the host of a UNC share, which
+    Path.as_uri() writes as file://server/share/..., so it resolves to
+    \\\\server\\share\\... and not to \\share\\... on the current drive.
+    """
+    from urllib.parse import urlparse
+    from urllib.request import url2pathname
+
+    parsed = urlparse(url)
+    path = parsed.path
+    if parsed.netloc and parsed.netloc != "localhost":
+        path = f"//{parsed.netloc}{path}"
+    return Path(url2pathname(path))
+
+
 def flatten(x):
     result = []
     for el in x: